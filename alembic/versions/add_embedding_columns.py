@@ -33,10 +33,11 @@ def upgrade() -> None:
     op.create_index(op.f('ix_questions_is_embedded'), 'questions', ['is_embedded'], unique=False)
     
     # Optional: Create an IVFFlat index for faster similarity search at scale
-    # Uncomment if you have many questions (10k+)
+    # Uncomment if you have many questions (10k+). Search ranks unit-length
+    # embeddings by inner product (<#>), so the index must use vector_ip_ops
     # op.execute('''
     #     CREATE INDEX questions_embedding_idx ON questions 
-    #     USING ivfflat (embedding vector_cosine_ops)
+    #     USING ivfflat (embedding vector_ip_ops)
     #     WITH (lists = 100)
     # ''')
 
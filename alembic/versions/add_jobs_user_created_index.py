@@ -0,0 +1,41 @@
+"""add composite index on jobs (user_id, created_at desc)
+
+Revision ID: add_jobs_user_created_idx
+Revises: add_jobs_table
+Create Date: 2026-10-16
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'add_jobs_user_created_idx'
+down_revision: Union[str, None] = 'add_jobs_table'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Serves get_jobs_by_user (WHERE user_id = ? ORDER BY created_at DESC)
+    # as an index range scan instead of a scan + sort.
+    # CONCURRENTLY avoids locking writes to jobs but cannot run in a transaction.
+    with op.get_context().autocommit_block():
+        op.create_index(
+            'ix_jobs_user_created',
+            'jobs',
+            ['user_id', sa.text('created_at DESC')],
+            unique=False,
+            postgresql_concurrently=True,
+        )
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.drop_index(
+            'ix_jobs_user_created',
+            table_name='jobs',
+            postgresql_concurrently=True,
+        )
@@ -1,7 +1,6 @@
 """Classification Agent - classifies questions by subject, difficulty, and other metadata.
 
 This agent uses LangChain tools for reusable operations:
-- parse_json_array: Parse JSON arrays from LLM responses
 - classify_question: Classify a single question
 - classify_questions_batch: Classify multiple questions efficiently
 """
@@ -15,7 +14,9 @@ from app.services.extraction_orchestrator import AgentState
 from app.services.prompt_template_builder import PromptTemplateBuilder
 from app.database import SessionLocal
 from app.models import Question
-from app.tools import parse_json_array, classify_question, classify_questions_batch
+from app.services.similarity_cache import search_result_cache
+from app.tools import classify_question, classify_questions_batch
+from app.tools.json_tools import extract_json_array
 from app.observability import traceable
 from llms import get_llm
 
@@ -134,6 +135,8 @@ class ClassificationAgent:
             
             # Commit changes
             db.commit()
+            # Cached search results embed the old classification fields
+            search_result_cache.invalidate(state.get("user_id"))
             
             state["metadata"]["classified_count"] = classified_count
             
@@ -159,7 +162,8 @@ class ClassificationAgent:
         """
         Use LLM to classify questions.
         
-        Uses the classify_questions_batch tool for efficient batch classification.
+        Uses the classify_questions_batch tool, which splits large documents
+        into chunks that are classified concurrently.
         
         Args:
             questions_data: List of question dictionaries
@@ -186,7 +190,7 @@ class ClassificationAgent:
         """
         Parse JSON array of classifications from LLM response.
         
-        Uses the parse_json_array tool (LangChain @tool) for consistent parsing.
+        Uses the same parser as the parse_json_array tool, without the tool wrapper.
         
         Args:
             response_text: Raw LLM response
@@ -194,8 +198,7 @@ class ClassificationAgent:
         Returns:
             List of classification dictionaries
         """
-        # Delegate to the parse_json_array tool
-        return parse_json_array.invoke(response_text)
+        return extract_json_array(response_text)
     
     def classify_single_question(self, question_id: str) -> bool:
         """
@@ -241,7 +244,10 @@ class ClassificationAgent:
                 question.tags = classification.get("tags", [])
                 question.is_classified = True
                 
+                # Read before commit() expires the instance
+                user_id = question.user_id
                 db.commit()
+                search_result_cache.invalidate(user_id)
                 
                 logger.info(f"Successfully classified question: {question_id}")
                 return True
@@ -326,8 +332,13 @@ class ClassificationAgent:
                     
                     classified_count += 1
             
+            # Collected before commit() expires the loaded rows
+            affected_users = {question.user_id for question in questions}
             db.commit()
             
+            for affected_user in affected_users:
+                search_result_cache.invalidate(affected_user)
+            
             logger.info(f"Successfully classified {classified_count} questions")
             return classified_count
             
@@ -1,5 +1,6 @@
 """Markdown Validation Agent - validates markdown quality against source document using LLM."""
 
+import hashlib
 import json
 import logging
 import os
@@ -227,14 +228,26 @@ class MarkdownValidationAgent:
             
             logger.info(f"  - Source file: {source_info.get('filename', 'unknown')}")
             
-            # Step 3: Call LLM to validate quality
-            logger.info(f"  - Calling LLM for quality assessment...")
-            validation_result = self._validate_with_llm(
-                markdown_content=markdown_content,
-                image_files=image_files,
-                source_info=source_info,
-                file_type=state.get("file_type", "unknown")
-            )
+            # Step 3: Call LLM to validate quality, unless this exact markdown
+            # already failed on an earlier attempt (the verdict would not change)
+            content_hash = hashlib.blake2b(markdown_content.encode("utf-8"), digest_size=16).hexdigest()
+            failed_hashes = state["metadata"].setdefault("failed_content_hashes", [])
+            if content_hash in failed_hashes:
+                logger.warning("  - Output unchanged from a failed attempt, skipping LLM validation")
+                validation_result = {
+                    "passed": False,
+                    "score": state["metadata"].get("validation_score", 0),
+                    "issues": state["metadata"].get("validation_issues", []),
+                    "recommendation": "Conversion output identical to a previous failed attempt",
+                }
+            else:
+                logger.info(f"  - Calling LLM for quality assessment...")
+                validation_result = self._validate_with_llm(
+                    markdown_content=markdown_content,
+                    image_files=image_files,
+                    source_info=source_info,
+                    file_type=state.get("file_type", "unknown")
+                )
             
             # Step 4: Process validation result
             if validation_result:
@@ -251,6 +264,8 @@ class MarkdownValidationAgent:
                 logger.info(f"  - Validation result: {'PASSED' if passed else 'FAILED'} (score: {score}/100)")
                 
                 if not passed:
+                    if content_hash not in failed_hashes:
+                        failed_hashes.append(content_hash)
                     logger.warning(f"  - Issues found: {issues}")
                     logger.warning(f"  - Recommendation: {recommendation}")
                     
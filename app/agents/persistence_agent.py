@@ -132,10 +132,10 @@ class PersistenceAgent:
             logger.info(f"  - Created document record: {document.id}")
             
             # Step 5: Create Question records
-            question_ids = []
-            
-            for q_data in questions_data:
-                question = Question(
+            # Flushed together so SQLAlchemy sends one batched multi-row INSERT
+            # instead of one INSERT round-trip per question.
+            questions = [
+                Question(
                     document_id=document.id,
                     user_id=user_id,
                     question_number=q_data.get("question_number"),
@@ -145,10 +145,11 @@ class PersistenceAgent:
                     image_urls=q_data.get("image_urls", []),
                     extra_metadata=q_data.get("metadata"),
                 )
-                
-                db.add(question)
-                db.flush()
-                question_ids.append(str(question.id))
+                for q_data in questions_data
+            ]
+            db.add_all(questions)
+            db.flush()
+            question_ids = [str(question.id) for question in questions]
             
             # Commit all changes
             db.commit()
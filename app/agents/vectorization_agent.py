@@ -5,7 +5,8 @@ import uuid
 from typing import Optional
 
 from app.services.extraction_orchestrator import AgentState
-from app.services.embedding_service import EmbeddingService
+from app.services.embedding_service import EmbeddingService, get_default_embedding_service
+from app.services.similarity_cache import search_result_cache
 from app.database import SessionLocal
 from app.models import Question
 from app.observability import traceable
@@ -30,7 +31,7 @@ class VectorizationAgent:
         Args:
             embedding_service: Optional pre-configured embedding service
         """
-        self.embedding_service = embedding_service or EmbeddingService()
+        self.embedding_service = embedding_service or get_default_embedding_service()
     
     @traceable(name="VectorizationAgent.process", tags=["agent", "vectorization"])
     def process(self, state: AgentState) -> AgentState:
@@ -90,17 +91,15 @@ class VectorizationAgent:
             
             logger.info(f"  - Loaded {len(questions)} questions from database")
             
-            # Step 2: Build text representations
-            texts = self.embedding_service.build_question_texts(questions)
-            
             # Log sample text for debugging
-            if texts:
-                sample_text = texts[0][:200] + "..." if len(texts[0]) > 200 else texts[0]
+            if logger.isEnabledFor(logging.DEBUG):
+                sample_text = self.embedding_service.build_question_text(questions[0])
+                sample_text = sample_text[:200] + "..." if len(sample_text) > 200 else sample_text
                 logger.debug(f"  - Sample text for embedding: {sample_text}")
             
-            # Step 3: Generate embeddings in batch
+            # Steps 2-3: Build text representations and generate embeddings in batch
             logger.info(f"  - Generating embeddings using {self.embedding_service.provider}/{self.embedding_service.model}...")
-            embeddings = self.embedding_service.embed_texts(texts)
+            embeddings = self.embedding_service.embed_questions(questions)
             
             logger.info(f"  - Generated {len(embeddings)} embeddings")
             
@@ -114,6 +113,9 @@ class VectorizationAgent:
             # Commit changes
             db.commit()
             
+            # The user's searchable questions changed; drop their cached searches
+            search_result_cache.invalidate(state.get("user_id"))
+            
             # Update state
             state["vector_ids"] = question_ids  # Same as question_ids since we embed each question
             state["metadata"]["embedded_count"] = embedded_count
@@ -219,16 +221,20 @@ class VectorizationAgent:
             logger.info(f"Embedding {len(questions)} questions...")
             
             # Build texts and generate embeddings
-            texts = self.embedding_service.build_question_texts(questions)
-            embeddings = self.embedding_service.embed_texts(texts)
+            embeddings = self.embedding_service.embed_questions(questions)
             
             # Update questions
             for question, embedding in zip(questions, embeddings):
                 question.embedding = embedding
                 question.is_embedded = True
             
+            # Collected before commit() expires the loaded rows
+            affected_users = {question.user_id for question in questions}
             db.commit()
             
+            for affected_user in affected_users:
+                search_result_cache.invalidate(affected_user)
+            
             logger.info(f"Successfully embedded {len(questions)} questions")
             return len(questions)
             
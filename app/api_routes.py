@@ -134,12 +134,33 @@ class ProcessDocResponse(BaseModel):
     message: str = Field(..., description="Response message")
 
 
-def _run_extraction_pipeline(initial_state: AgentState) -> dict:
+def _publish_partial_results(job_id: str, state: dict) -> None:
+    """Record persisted document results on the job while enrichment continues."""
+    db = None
+    try:
+        db = SessionLocal()
+        JobService.record_results(
+            db=db,
+            job_id=job_id,
+            document_id=UUID(state["document_id"]),
+            question_count=len(state.get("question_ids") or []),
+        )
+    except Exception as e:
+        # Best effort: the final complete_job() call records the same values
+        logger.warning(f"Failed to publish partial results for job {job_id}: {e}")
+    finally:
+        if db:
+            db.close()
+
+
+async def _run_extraction_pipeline(initial_state: AgentState) -> dict:
     """
-    Run the extraction pipeline synchronously.
+    Run the extraction pipeline on the event loop.
     
-    This function is designed to be run in a thread pool to avoid blocking
-    the async event loop.
+    Graph nodes are async and offload their blocking agent work to worker
+    threads, so awaiting the graph does not block other requests. The state
+    is streamed step by step so persisted results are published on the job
+    as soon as they exist, not only after the whole pipeline finishes.
     
     Args:
         initial_state: Initial agent state
@@ -148,14 +169,19 @@ def _run_extraction_pipeline(initial_state: AgentState) -> dict:
         Final state dictionary from the pipeline
     """
     graph = create_extraction_graph()
-    return graph.invoke(initial_state)
+    final_state = initial_state
+    async for state in graph.astream(initial_state, stream_mode="values"):
+        if state.get("document_id") and not final_state.get("document_id"):
+            await asyncio.to_thread(_publish_partial_results, initial_state["job_id"], state)
+        final_state = state
+    return final_state
 
 
 async def process_document_background(document_url: str, user_id: str, job_id: str):
     """
     Background task to process document through LangGraph pipeline.
     
-    Runs the blocking pipeline in a thread pool to avoid blocking the event loop.
+    Awaits the async pipeline; blocking agent work runs in worker threads.
     
     Args:
         document_url: URL of the document in GCS
@@ -198,8 +224,8 @@ async def process_document_background(document_url: str, user_id: str, job_id: s
             "public_markdown": None,  # Markdown with public GCS image URLs
         }
         
-        # Run the blocking pipeline in a thread pool to avoid blocking the event loop
-        final_state = await asyncio.to_thread(_run_extraction_pipeline, initial_state)
+        # Run the async pipeline (agent work is offloaded to worker threads)
+        final_state = await _run_extraction_pipeline(initial_state)
         
         # Check for soft failures (pipeline completed but no output)
         db = SessionLocal()
@@ -370,7 +396,7 @@ async def serve_image(
             content=content,
             media_type=content_type,
             headers={
-                "Cache-Control": "public, max-age=31536000",  # Cache for 1 year
+                "Cache-Control": "public, max-age=31536000, immutable",  # Cache for 1 year
                 "Content-Disposition": f"inline; filename=\"{filename}\""
             }
         )
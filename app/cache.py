@@ -0,0 +1,74 @@
+"""Small thread-safe in-memory LRU cache for hot lookups."""
+
+import threading
+from collections import OrderedDict
+from typing import Any, Hashable, Optional
+
+
+class LRUCache:
+    """Bounded mapping that evicts the least recently used entry when full.
+
+    A ``maxsize`` of 0 disables caching: ``set`` becomes a no-op and
+    ``get`` always misses. With ``maxbytes``, values must support
+    ``len()`` (e.g. ``bytes``) and the least recently used entries are also
+    evicted while their total length exceeds it; a single value larger than
+    ``maxbytes`` is not stored.
+    """
+
+    def __init__(self, maxsize: int = 1024, maxbytes: Optional[int] = None):
+        self.maxsize = maxsize
+        self.maxbytes = maxbytes
+        # key -> (value, nbytes); nbytes is 0 without a byte budget
+        self._data: OrderedDict = OrderedDict()
+        self._nbytes = 0
+        self._lock = threading.Lock()
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        """Return the cached value for ``key`` and mark it as recently used."""
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is None:
+                return default
+            self._data.move_to_end(key)
+            return entry[0]
+
+    def set(self, key: Hashable, value: Any) -> None:
+        """Store ``value`` under ``key``, evicting the oldest entry if needed."""
+        if self.maxsize <= 0:
+            return
+        nbytes = len(value) if self.maxbytes is not None else 0
+        if self.maxbytes is not None and nbytes > self.maxbytes:
+            return
+        with self._lock:
+            old = self._data.pop(key, None)
+            if old is not None:
+                self._nbytes -= old[1]
+            self._data[key] = (value, nbytes)
+            self._nbytes += nbytes
+            while len(self._data) > self.maxsize or (
+                self.maxbytes is not None and self._nbytes > self.maxbytes
+            ):
+                self._nbytes -= self._data.popitem(last=False)[1][1]
+
+    def pop(self, key: Hashable, default: Any = None) -> Any:
+        """Remove ``key`` and return its value (or ``default``)."""
+        with self._lock:
+            entry = self._data.pop(key, None)
+            if entry is None:
+                return default
+            self._nbytes -= entry[1]
+            return entry[0]
+
+    def clear(self) -> None:
+        """Drop all cached entries."""
+        with self._lock:
+            self._data.clear()
+            self._nbytes = 0
+
+    def __contains__(self, key: Hashable) -> bool:
+        sentinel = object()
+        return self.get(key, sentinel) is not sentinel
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._data)
@@ -19,11 +19,15 @@ class Settings(BaseSettings):
     google_cloud_storage_bucket: str
     google_application_credentials: str
     signed_url_expiration_seconds: int = 604800  # Default: 7 days (max allowed by GCS)
+    image_cache_size: int = 256  # In-memory LRU of served image bytes (0 disables)
+    image_cache_max_mb: int = 64  # Byte budget for the image cache, in MB
+    image_upload_concurrency: int = 8  # Parallel GCS uploads when storing a job's extracted images
 
     # API Configuration
     api_host: str = "0.0.0.0"
     api_port: int = 8000
     api_base_url: str = "http://localhost:8000"  # Base URL for generating public links
+    client_secret_bcrypt_rounds: int = 12  # bcrypt cost for newly hashed client secrets (each +1 doubles the work)
 
     # Database Configuration
     database_url: str
@@ -42,11 +46,28 @@ class Settings(BaseSettings):
     # Validation Configuration
     validation_llm_model: str = "llama-3.3-70b-versatile"  # LLM model for markdown validation
     max_validation_attempts: int = 3  # Maximum retry attempts for validation
+    parallel_enrichment: bool = False  # Run classification and vectorization concurrently (embeddings lose classification context)
+    classification_chunk_size: int = 20  # Questions per classification LLM call (0 = all in one call)
+    classification_max_concurrency: int = 4  # Classification chunks sent to the LLM at once
+    classification_cache_size: int = 10000  # In-memory LRU of question content -> classification (0 disables)
+
+    # Job progress updates
+    job_status_write_behind: bool = False  # Coalesce per-node status updates into batched UPDATEs
+    job_status_flush_ms: int = 50  # How long pending status updates wait for others to join
     
     # Embedding Configuration
     embedding_provider: str = "huggingface"  # "huggingface" or "openai"
     embedding_model: str = "all-MiniLM-L6-v2"  # Model name for embeddings
     embedding_dimensions: int = 384  # Must match model output dimensions
+    embedding_device: Optional[str] = None  # "cuda", "mps" or "cpu"; auto-detected when unset
+    embedding_batch_size: int = 64  # Batch size for local (HuggingFace) encoding
+    embedding_quantize: bool = False  # int8 dynamic quantization for CPU-bound HuggingFace models
+    embedding_cache_size: int = 1024  # In-memory LRU of text -> embedding (0 disables)
+
+    # Search Configuration
+    search_cache_size: int = 0  # Recent searches cached per user and reused for near-identical queries (0 disables)
+    search_cache_similarity: float = 0.97  # Minimum query cosine similarity to reuse cached results
+    search_cache_ttl_seconds: int = 60  # Cached search results expire after this
 
     # LangSmith Configuration (optional)
     langsmith_api_key: Optional[str] = None
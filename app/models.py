@@ -1,7 +1,7 @@
 """Database models."""
 
 import uuid
-from sqlalchemy import Column, String, Boolean, DateTime, Integer, Text, Float, ForeignKey
+from sqlalchemy import Column, String, Boolean, DateTime, Integer, Text, Float, ForeignKey, Index
 from sqlalchemy.dialects.postgresql import JSONB, UUID
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
@@ -51,6 +51,11 @@ class Job(Base):
     # Relationship to document
     document = relationship("Document", foreign_keys=[document_id])
     
+    __table_args__ = (
+        # Per-user job listing, newest first (JobService.get_jobs_by_user)
+        Index("ix_jobs_user_created", "user_id", created_at.desc()),
+    )
+    
     def __repr__(self):
         return f"<Job(id='{self.id}', status='{self.status}', user_id='{self.user_id}')>"
     
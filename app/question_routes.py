@@ -11,6 +11,7 @@ from sqlalchemy.orm import Session
 from app.auth import authenticate_client
 from app.database import get_db
 from app.models import ClientCredential, Document, Question
+from app.services.similarity_cache import search_result_cache
 
 logger = logging.getLogger(__name__)
 
@@ -278,9 +279,9 @@ async def update_question(
     # Optionally re-embed
     if body.re_embed:
         try:
-            from app.services.embedding_service import EmbeddingService
+            from app.services.embedding_service import get_default_embedding_service
 
-            svc = EmbeddingService()
+            svc = get_default_embedding_service()
             text = svc.build_question_text(question)
             embedding = svc.embed_text(text)
             question.embedding = embedding
@@ -290,6 +291,8 @@ async def update_question(
 
     db.commit()
     db.refresh(question)
+    # Cached search results hold the question's old text and embedding
+    search_result_cache.invalidate(question.user_id)
 
     return QuestionDetail(
         id=str(question.id),
@@ -3,7 +3,7 @@
 import functools
 import logging
 import time
-from typing import Sequence, Type
+from typing import Callable, Optional, Sequence, Type
 
 logger = logging.getLogger(__name__)
 
@@ -13,6 +13,7 @@ def retry_with_backoff(
     base_delay: float = 1.0,
     exponential_base: float = 2.0,
     retryable_exceptions: Sequence[Type[BaseException]] = (Exception,),
+    sleep: Optional[Callable[[float], None]] = None,
 ):
     """Decorator that retries a function with exponential backoff.
 
@@ -21,6 +22,9 @@ def retry_with_backoff(
         base_delay: Initial delay in seconds before the first retry.
         exponential_base: Multiplier applied to the delay after each retry.
         retryable_exceptions: Tuple of exception types that trigger a retry.
+        sleep: Called with each backoff delay in seconds (tests pass a recorder).
+            Defaults to ``time.sleep``, looked up at call time so patching
+            ``app.retry.time.sleep`` still applies.
     """
 
     def decorator(func):
@@ -42,7 +46,7 @@ def retry_with_backoff(
                             exc,
                             delay,
                         )
-                        time.sleep(delay)
+                        (sleep or time.sleep)(delay)
                     else:
                         logger.error(
                             "All %d attempts for %s exhausted. Last error: %s",
@@ -11,6 +11,12 @@ from app.config import settings
 
 logger = logging.getLogger(__name__)
 
+# Chunk size for streaming downloads to disk
+DOWNLOAD_CHUNK_SIZE = 1 << 20  # 1 MiB
+
+# Form-field encoding of boolean options
+_FORM_BOOL = {True: "true", False: "false"}
+
 
 @dataclass
 class DoclingOptions:
@@ -111,6 +117,10 @@ class DoclingService:
         self.file_endpoint = settings.docling_file_api_url
         self.timeout = settings.docling_timeout_seconds
         self.temp_dir = settings.docling_temp_dir
+        # Default options never change, so their payload is built once
+        self._default_options_payload = self._static_options_payload(DoclingOptions())
+        # file_type -> ZIP form fields for default options
+        self._default_zip_form_data: dict[str, dict[str, str]] = {}
     
     def _build_options_payload(self, file_type: str, options: Optional[DoclingOptions] = None) -> dict:
         """
@@ -123,10 +133,25 @@ class DoclingService:
         Returns:
             Dictionary of options for the API payload
         """
-        opts = options or DoclingOptions()
+        static_payload = (
+            self._default_options_payload
+            if options is None
+            else self._static_options_payload(options)
+        )
+        return {"from_formats": [file_type], **static_payload}
+    
+    @staticmethod
+    def _static_options_payload(opts: DoclingOptions) -> dict:
+        """
+        Build the file-type independent part of the options payload.
         
+        Args:
+            opts: DoclingOptions to read values from
+            
+        Returns:
+            Dictionary of option fields sent to the API
+        """
         return {
-            "from_formats": [file_type],
             "to_formats": opts.to_formats,
             "image_export_mode": opts.image_export_mode,
             "do_ocr": opts.do_ocr,
@@ -271,11 +296,15 @@ class DoclingService:
         logger.info(f"Converting file to markdown: {file_path}")
         logger.info(f"  - File type: {file_type}")
         
-        # Verify file exists
-        if not os.path.exists(file_path):
+        # Verify file exists (single stat; also yields the upload name)
+        source = Path(file_path)
+        try:
+            file_size = source.stat().st_size
+        except FileNotFoundError:
             error_msg = f"File not found: {file_path}"
             logger.error(error_msg)
             return DoclingResponse(success=False, error=error_msg)
+        logger.info(f"  - File size: {file_size} bytes")
         
         # Build options payload
         options_payload = self._build_options_payload(file_type, options)
@@ -284,7 +313,7 @@ class DoclingService:
             # Open file and send as multipart/form-data
             with open(file_path, "rb") as f:
                 files = {
-                    "files": (os.path.basename(file_path), f, "application/octet-stream")
+                    "files": (source.name, f, "application/octet-stream")
                 }
                 data = {
                     "options": json.dumps(options_payload)
@@ -323,6 +352,70 @@ class DoclingService:
             logger.error(error_msg, exc_info=True)
             return DoclingResponse(success=False, error=error_msg)
     
+    def _zip_form_data(self, file_type: str, options: Optional[DoclingOptions] = None) -> dict[str, str]:
+        """
+        Get the multipart form fields for a ZIP conversion request.
+        
+        Default options are serialized once per file type and reused, so
+        batches converted with default options skip rebuilding the fields
+        and re-encoding the options JSON.
+        
+        Args:
+            file_type: The detected file type
+            options: Optional DoclingOptions to customize conversion
+            
+        Returns:
+            Dictionary of form field names to string values
+        """
+        if options is not None:
+            return self._build_zip_form_data(file_type, options)
+        
+        form_data = self._default_zip_form_data.get(file_type)
+        if form_data is None:
+            form_data = self._build_zip_form_data(file_type, DoclingOptions())
+            self._default_zip_form_data[file_type] = form_data
+        return form_data
+    
+    def _build_zip_form_data(self, file_type: str, opts: DoclingOptions) -> dict[str, str]:
+        """
+        Build the multipart form fields for a ZIP conversion request.
+        
+        Args:
+            file_type: The detected file type
+            opts: DoclingOptions to serialize
+            
+        Returns:
+            Dictionary of form field names to string values
+        """
+        options_payload = self._build_options_payload(file_type, opts)
+        options_payload["target_type"] = "zip"  # Ensure it's in the payload
+        
+        # Options as individual fields
+        # Some APIs expect options as separate form fields rather than a JSON blob
+        return {
+            "target_type": "zip",
+            "image_export_mode": opts.image_export_mode,
+            "include_images": _FORM_BOOL[opts.include_images],
+            "images_scale": str(opts.images_scale),
+            "do_ocr": _FORM_BOOL[opts.do_ocr],
+            "force_ocr": _FORM_BOOL[opts.force_ocr],
+            "ocr_engine": opts.ocr_engine,
+            "pdf_backend": opts.pdf_backend,
+            "table_mode": opts.table_mode,
+            "table_cell_matching": _FORM_BOOL[opts.table_cell_matching],
+            "do_table_structure": _FORM_BOOL[opts.do_table_structure],
+            "abort_on_error": _FORM_BOOL[opts.abort_on_error],
+            "pipeline": opts.pipeline,
+            "document_timeout": str(opts.document_timeout),
+            # Enrichment options
+            "do_formula_enrichment": _FORM_BOOL[opts.do_formula_enrichment],
+            "do_code_enrichment": _FORM_BOOL[opts.do_code_enrichment],
+            "do_picture_classification": _FORM_BOOL[opts.do_picture_classification],
+            "do_picture_description": _FORM_BOOL[opts.do_picture_description],
+            # Also include the full options JSON as fallback
+            "options": json.dumps(options_payload),
+        }
+    
     def convert_file_to_zip(
         self,
         file_path: str,
@@ -349,51 +442,29 @@ class DoclingService:
         logger.info(f"  - File type: {file_type}")
         logger.info(f"  - Job ID: {job_id}")
         
-        # Verify file exists
-        if not os.path.exists(file_path):
+        # Verify file exists (single stat; also yields the upload name)
+        source = Path(file_path)
+        try:
+            file_size = source.stat().st_size
+        except FileNotFoundError:
             error_msg = f"File not found: {file_path}"
             logger.error(error_msg)
             return DoclingZipResponse(success=False, error=error_msg)
+        logger.info(f"  - File size: {file_size} bytes")
         
         # Create job output directory
         job_output_dir = Path(self.temp_dir) / job_id
         job_output_dir.mkdir(parents=True, exist_ok=True)
         output_zip_path = job_output_dir / "output.zip"
         
-        # Build options payload with target_type forced to "zip"
+        # Force ZIP output
         opts = options or DoclingOptions()
-        opts.target_type = "zip"  # Force ZIP output
-        options_payload = self._build_options_payload(file_type, opts)
-        options_payload["target_type"] = "zip"  # Ensure it's in the payload
+        opts.target_type = "zip"
         
         # Log the key options being used
         logger.debug(f"Docling API options: image_export_mode={opts.image_export_mode}, include_images={opts.include_images}")
         
-        # Build form data with options as individual fields
-        # Some APIs expect options as separate form fields rather than a JSON blob
-        form_data = {
-            "target_type": "zip",
-            "image_export_mode": opts.image_export_mode,
-            "include_images": str(opts.include_images).lower(),
-            "images_scale": str(opts.images_scale),
-            "do_ocr": str(opts.do_ocr).lower(),
-            "force_ocr": str(opts.force_ocr).lower(),
-            "ocr_engine": opts.ocr_engine,
-            "pdf_backend": opts.pdf_backend,
-            "table_mode": opts.table_mode,
-            "table_cell_matching": str(opts.table_cell_matching).lower(),
-            "do_table_structure": str(opts.do_table_structure).lower(),
-            "abort_on_error": str(opts.abort_on_error).lower(),
-            "pipeline": opts.pipeline,
-            "document_timeout": str(opts.document_timeout),
-            # Enrichment options
-            "do_formula_enrichment": str(opts.do_formula_enrichment).lower(),
-            "do_code_enrichment": str(opts.do_code_enrichment).lower(),
-            "do_picture_classification": str(opts.do_picture_classification).lower(),
-            "do_picture_description": str(opts.do_picture_description).lower(),
-            # Also include the full options JSON as fallback
-            "options": json.dumps(options_payload),
-        }
+        form_data = self._zip_form_data(file_type, options)
         
         logger.debug(f"Form data: target_type={form_data['target_type']}, image_export_mode={form_data['image_export_mode']}")
         
@@ -401,7 +472,7 @@ class DoclingService:
             # Open file and send as multipart/form-data
             with open(file_path, "rb") as f:
                 files = {
-                    "files": (os.path.basename(file_path), f, "application/octet-stream")
+                    "files": (source.name, f, "application/octet-stream")
                 }
                 
                 with httpx.Client(timeout=self.timeout) as client:
@@ -499,14 +570,17 @@ class DoclingService:
         
         try:
             with httpx.Client(timeout=self.timeout) as client:
-                response = client.get(url)
-                response.raise_for_status()
-                
-                # Write content to file
-                with open(file_path, "wb") as f:
-                    f.write(response.content)
+                with client.stream("GET", url) as response:
+                    response.raise_for_status()
+                    
+                    # Stream content to file without buffering the whole payload
+                    bytes_written = 0
+                    with open(file_path, "wb") as f:
+                        for chunk in response.iter_bytes(chunk_size=DOWNLOAD_CHUNK_SIZE):
+                            f.write(chunk)
+                            bytes_written += len(chunk)
                 
-                logger.info(f"Downloaded file to: {file_path} ({len(response.content)} bytes)")
+                logger.info(f"Downloaded file to: {file_path} ({bytes_written} bytes)")
                 return str(file_path)
                 
         except httpx.TimeoutException:
@@ -1,8 +1,12 @@
 """Embedding service for generating vector embeddings with configurable providers."""
 
 import logging
-from typing import Optional
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+from itertools import islice
+from typing import Iterator, Optional
 
+from app.cache import LRUCache
 from app.config import settings
 from app.models import Question
 from app.retry import retry_with_backoff
@@ -34,14 +38,24 @@ class EmbeddingService:
         self.model = model or settings.embedding_model
         self.dimensions = settings.embedding_dimensions
         self._embeddings = None
+        self._embeddings_lock = threading.Lock()
+        # Keyed on text alone: provider and model are fixed per instance
+        self._cache = LRUCache(maxsize=settings.embedding_cache_size)
+        self._with_retry = retry_with_backoff(
+            max_retries=2,
+            base_delay=1.0,
+            retryable_exceptions=self._transient_errors(),
+        )
         
         logger.info(f"Initializing EmbeddingService with provider={self.provider}, model={self.model}")
     
     @property
     def embeddings(self):
-        """Lazy-load the embeddings model."""
+        """Lazy-load the embeddings model (once, even with concurrent callers)."""
         if self._embeddings is None:
-            self._embeddings = self._create_embeddings()
+            with self._embeddings_lock:
+                if self._embeddings is None:
+                    self._embeddings = self._create_embeddings()
         return self._embeddings
     
     def _create_embeddings(self):
@@ -66,12 +80,22 @@ class EmbeddingService:
             try:
                 from langchain_community.embeddings import HuggingFaceEmbeddings  # type: ignore[import-not-found]
                 
-                logger.info(f"Creating HuggingFace embeddings with model: {self.model}")
-                return HuggingFaceEmbeddings(
+                device = self._resolve_device()
+                logger.info(f"Creating HuggingFace embeddings with model: {self.model} on device: {device}")
+                embeddings = HuggingFaceEmbeddings(
                     model_name=self.model,
-                    model_kwargs={'device': 'cpu'},  # Use CPU for compatibility
-                    encode_kwargs={'normalize_embeddings': True}
+                    model_kwargs={'device': device},
+                    encode_kwargs={
+                        'normalize_embeddings': True,
+                        'batch_size': settings.embedding_batch_size,
+                    }
                 )
+                if device != "cpu":
+                    # FP16 halves memory bandwidth on accelerators; CPU stays FP32
+                    embeddings.client.half()
+                elif settings.embedding_quantize:
+                    embeddings.client = self._quantize_cpu_model(embeddings.client)
+                return embeddings
             except ImportError:
                 logger.error("langchain-community or sentence-transformers not installed.")
                 logger.error("Run: pip install langchain-community sentence-transformers")
@@ -80,28 +104,116 @@ class EmbeddingService:
                 logger.error(f"Failed to create HuggingFace embeddings: {e}")
                 raise
     
-    @retry_with_backoff(max_retries=2, base_delay=1.0)
+    @staticmethod
+    def _resolve_device() -> str:
+        """
+        Pick the device for local embedding models.
+
+        Uses ``settings.embedding_device`` when set, otherwise prefers CUDA,
+        then Apple MPS, and falls back to CPU.
+
+        Returns:
+            Device string understood by sentence-transformers
+        """
+        if settings.embedding_device:
+            return settings.embedding_device
+
+        try:
+            import torch  # type: ignore[import-not-found]
+        except ImportError:
+            return "cpu"
+
+        if torch.cuda.is_available():
+            return "cuda"
+        mps = getattr(torch.backends, "mps", None)
+        if mps is not None and mps.is_available():
+            return "mps"
+        return "cpu"
+
+    def _transient_errors(self) -> tuple[type[BaseException], ...]:
+        """
+        Exception types worth retrying for the configured provider.
+
+        Only remote OpenAI calls have transient failures (rate limits,
+        timeouts, connection errors, 5xx). Local HuggingFace models fail
+        deterministically, so nothing is retried for them.
+
+        Returns:
+            Tuple of retryable exception types (empty means no retries)
+        """
+        if self.provider != "openai":
+            return ()
+        try:
+            import openai  # type: ignore[import-not-found]
+        except ImportError:
+            return ()
+        return (
+            openai.RateLimitError,
+            openai.APITimeoutError,
+            openai.APIConnectionError,
+            openai.InternalServerError,
+        )
+
+    @staticmethod
+    def _quantize_cpu_model(model):
+        """
+        Apply int8 dynamic quantization to the Linear layers of a CPU model.
+
+        Falls back to the original FP32 model if quantization is unavailable.
+
+        Args:
+            model: The underlying SentenceTransformer instance
+
+        Returns:
+            The quantized model, or the original one on failure
+        """
+        try:
+            import torch  # type: ignore[import-not-found]
+
+            quantized = torch.quantization.quantize_dynamic(
+                model, {torch.nn.Linear}, dtype=torch.qint8
+            )
+            logger.info("Applied int8 dynamic quantization to embedding model")
+            return quantized
+        except Exception as e:
+            logger.warning(f"int8 quantization failed, using FP32 model: {e}")
+            return model
+
     def embed_text(self, text: str) -> list[float]:
         """
         Generate embedding for a single text.
 
+        Identical texts are served from an in-memory LRU cache.
+
         Args:
             text: Text to embed
 
         Returns:
             List of floats representing the embedding vector
         """
+        cached = self._cache.get(text)
+        if cached is not None:
+            return list(cached)
+
+        embedding = self._embed_query(text)
+        self._cache.set(text, embedding)
+        return list(embedding)
+
+    def _embed_query(self, text: str) -> list[float]:
+        """Call the embeddings model for a single text."""
         try:
-            return self.embeddings.embed_query(text)
+            return self._with_retry(self.embeddings.embed_query)(text)
         except Exception as e:
             logger.error(f"Error embedding text: {e}")
             raise
 
-    @retry_with_backoff(max_retries=2, base_delay=1.0)
     def embed_texts(self, texts: list[str]) -> list[list[float]]:
         """
         Generate embeddings for multiple texts (batch processing).
 
+        Duplicate texts are embedded once and texts already in the cache
+        are not sent to the model; results keep the input order.
+
         Args:
             texts: List of texts to embed
 
@@ -111,8 +223,28 @@ class EmbeddingService:
         if not texts:
             return []
 
+        # Map each distinct text to its embedding, filling from the cache first
+        unique: dict[str, Optional[list[float]]] = {}
+        for text in texts:
+            if text not in unique:
+                unique[text] = self._cache.get(text)
+
+        misses = [text for text, embedding in unique.items() if embedding is None]
+        if misses:
+            logger.debug(
+                f"Embedding {len(misses)} of {len(texts)} texts "
+                f"({len(unique)} distinct)"
+            )
+            for text, embedding in zip(misses, self._embed_documents(misses)):
+                unique[text] = embedding
+                self._cache.set(text, embedding)
+
+        return [list(unique[text]) for text in texts]
+
+    def _embed_documents(self, texts: list[str]) -> list[list[float]]:
+        """Call the embeddings model for a batch of texts."""
         try:
-            return self.embeddings.embed_documents(texts)
+            return self._with_retry(self.embeddings.embed_documents)(texts)
         except Exception as e:
             logger.error(f"Error embedding texts batch: {e}")
             raise
@@ -135,10 +267,13 @@ class EmbeddingService:
         Returns:
             Combined text suitable for embedding
         """
-        text_parts = []
-        context_parts = []
-        
+        return "\n".join(EmbeddingService._iter_text_parts(question))
+
+    @staticmethod
+    def _iter_text_parts(question: Question) -> Iterator[str]:
+        """Yield each line of a question's embedding text in order."""
         # Build classification context prefix
+        context_parts = []
         if question.topic:
             context_parts.append(question.topic)
         if question.subtopic:
@@ -147,26 +282,23 @@ class EmbeddingService:
             context_parts.append(f"{question.difficulty} difficulty")
         if question.grade_level:
             context_parts.append(f"grade {question.grade_level}")
-        
+
         # Add context as a bracketed prefix
         if context_parts:
-            text_parts.append(f"[{' | '.join(context_parts)}]")
-        
+            yield "[" + " | ".join(context_parts) + "]"
+
         # Add tags as keywords
         if question.tags and isinstance(question.tags, list):
-            tags_str = ", ".join(question.tags[:5])  # Limit to 5 tags
-            text_parts.append(f"Keywords: {tags_str}")
-        
+            yield "Keywords: " + ", ".join(islice(question.tags, 5))  # Limit to 5 tags
+
         # Add question text
         if question.question_text:
-            text_parts.append(question.question_text.strip())
-        
-        # Add options for MCQ
+            yield question.question_text.strip()
+
+        # Add options for MCQ (keys are not guaranteed to be A-E, so sort)
         if question.options and isinstance(question.options, dict):
             for letter, option_text in sorted(question.options.items()):
-                text_parts.append(f"{letter}) {option_text}")
-        
-        return "\n".join(text_parts)
+                yield f"{letter}) {option_text}"
     
     @staticmethod
     def build_question_texts(questions: list[Question]) -> list[str]:
@@ -180,3 +312,53 @@ class EmbeddingService:
             List of text representations
         """
         return [EmbeddingService.build_question_text(q) for q in questions]
+
+    def embed_questions(self, questions: list[Question]) -> list[list[float]]:
+        """
+        Build texts for questions and embed them, overlapping the two stages.
+
+        Questions are processed in chunks of ``settings.embedding_batch_size``.
+        While one chunk is embedded on a worker thread, the next chunk's texts
+        are built on the calling thread, so string building hides behind
+        model/network latency. ORM objects are only touched by the caller's
+        thread.
+
+        Args:
+            questions: List of Question model instances
+
+        Returns:
+            List of embedding vectors, in the same order as ``questions``
+        """
+        if not questions:
+            return []
+
+        chunk_size = max(1, settings.embedding_batch_size)
+        embeddings: list[list[float]] = []
+        pending: Optional[Future] = None
+
+        with ThreadPoolExecutor(max_workers=1, thread_name_prefix="embed") as executor:
+            for start in range(0, len(questions), chunk_size):
+                texts = self.build_question_texts(questions[start:start + chunk_size])
+                if pending is not None:
+                    embeddings.extend(pending.result())
+                pending = executor.submit(self.embed_texts, texts)
+            embeddings.extend(pending.result())
+
+        return embeddings
+
+
+_default_service = None
+_default_service_lock = threading.Lock()
+
+
+def get_default_embedding_service() -> EmbeddingService:
+    """Return (or create) the process-wide service for the configured provider.
+
+    Sharing one instance means the model weights and the embedding cache are
+    loaded once per process rather than once per caller.
+    """
+    global _default_service
+    with _default_service_lock:
+        if _default_service is None:
+            _default_service = EmbeddingService()
+        return _default_service
@@ -1,17 +1,31 @@
 """LangGraph orchestration for multi-agent document question extraction."""
 
+import asyncio
+import functools
+import importlib
 import logging
-from typing import TypedDict, Literal
+from typing import Annotated, Awaitable, Callable, TypedDict, Literal
 from langgraph.graph import StateGraph, END
 
+try:
+    from langgraph.types import Send
+except ImportError:  # langgraph < 0.2.20
+    from langgraph.constants import Send
+
+from app.config import settings
 from app.database import SessionLocal
 from app.services.job_service import JobService
+from app.services.status_writer import get_status_writer
 
 logger = logging.getLogger(__name__)
 
 
 def _update_job_status(job_id: str, status: str, error_message: str = None) -> None:
     """Helper to update job status in database with retry."""
+    if settings.job_status_write_behind and not error_message:
+        get_status_writer().submit(job_id, status)
+        return
+    
     last_error = None
     for attempt in range(3):
         db = None
@@ -34,9 +48,24 @@ def _update_job_status(job_id: str, status: str, error_message: str = None) -> N
     )
 
 
+def _merge_metadata(current: dict | None, update: dict | None) -> dict:
+    """Reducer for ``AgentState.metadata``: merge updates key by key.
+
+    Lets parallel branches each report their own metadata keys in the same
+    step without one overwriting the other.
+    """
+    return {**(current or {}), **(update or {})}
+
+
 # Define the agent state schema
 class AgentState(TypedDict):
-    """State shared between agents in the extraction workflow."""
+    """State shared between agents in the extraction workflow.
+    
+    List fields (``extracted_questions``, ``vector_ids``, ``question_ids``)
+    keep LangGraph's default last-value semantics on purpose: each is written
+    by a single agent, and a validation retry must replace the previous
+    ``extracted_questions`` rather than append to it.
+    """
     
     # Job information
     job_id: str
@@ -58,7 +87,7 @@ class AgentState(TypedDict):
     # Status and metadata
     status: Literal["pending", "ingesting", "parsing", "extracting", "validating", "persisting", "classifying", "vectorizing", "completed", "failed"]
     error_message: str | None
-    metadata: dict
+    metadata: Annotated[dict, _merge_metadata]
     
     # Validation loop control
     validation_attempts: int
@@ -81,9 +110,24 @@ class AgentState(TypedDict):
     public_markdown: str | None  # Markdown with public GCS image URLs
 
 
+@functools.lru_cache(maxsize=1)
 def create_extraction_graph() -> StateGraph:
     """
-    Create the LangGraph state graph for document question extraction.
+    Get the compiled LangGraph state graph for document question extraction.
+    
+    The graph is built and compiled on first use and the same compiled
+    instance is returned afterwards; compiled graphs are safe to invoke
+    concurrently.
+    
+    Returns:
+        StateGraph: Compiled graph with all agent nodes and edges
+    """
+    return _build_extraction_graph()
+
+
+def _build_extraction_graph() -> StateGraph:
+    """
+    Build and compile the LangGraph state graph for document question extraction.
     
     Returns:
         StateGraph: Configured graph with all agent nodes and edges
@@ -97,8 +141,12 @@ def create_extraction_graph() -> StateGraph:
     workflow.add_node("question_extraction", question_extraction_node)
     workflow.add_node("markdown_validation", markdown_validation_node)
     workflow.add_node("persistence", persistence_node)
-    workflow.add_node("classification", classification_node)
-    workflow.add_node("vectorization", vectorization_node)
+    if settings.parallel_enrichment:
+        workflow.add_node("classification", _enrichment_branch(classification_node, ("metadata",)))
+        workflow.add_node("vectorization", _enrichment_branch(vectorization_node, ("metadata", "vector_ids")))
+    else:
+        workflow.add_node("classification", classification_node)
+        workflow.add_node("vectorization", vectorization_node)
     
     # Define the workflow edges
     # Start with ingestion
@@ -124,108 +172,159 @@ def create_extraction_graph() -> StateGraph:
         }
     )
     
-    # Persistence -> Classification (persistence creates questions, then we classify them)
-    workflow.add_edge("persistence", "classification")
+    if settings.parallel_enrichment:
+        # Persistence -> Classification + Vectorization in parallel, both -> END.
+        # Faster, but embeddings are built without classification context.
+        workflow.add_conditional_edges(
+            "persistence",
+            fan_out_enrichment,
+            ["classification", "vectorization"]
+        )
+        workflow.add_edge("classification", END)
+        workflow.add_edge("vectorization", END)
+    else:
+        # Persistence -> Classification (persistence creates questions, then we classify them)
+        workflow.add_edge("persistence", "classification")
+        
+        # Classification -> Vectorization (classification adds metadata, then we embed with that context)
+        workflow.add_edge("classification", "vectorization")
+        
+        # Vectorization -> END
+        workflow.add_edge("vectorization", END)
     
-    # Classification -> Vectorization (classification adds metadata, then we embed with that context)
-    workflow.add_edge("classification", "vectorization")
+    return workflow.compile()
+
+
+def fan_out_enrichment(state: AgentState) -> list[Send]:
+    """
+    Dispatch classification and vectorization as parallel branches.
     
-    # Vectorization -> END
-    workflow.add_edge("vectorization", END)
+    Each branch gets its own copy of the state (and of ``metadata``) so the
+    agents' in-place updates do not race.
     
-    return workflow.compile()
+    Args:
+        state: Current agent state after persistence
+        
+    Returns:
+        One Send per enrichment node
+    """
+    return [
+        Send(node, {**state, "metadata": dict(state.get("metadata") or {})})
+        for node in ("classification", "vectorization")
+    ]
 
 
-# Placeholder node functions (to be implemented in separate agent files)
-def ingestion_node(state: AgentState) -> AgentState:
-    """Ingestion Agent node - handles file upload and format detection."""
-    from app.agents.ingestion_agent import IngestionAgent
+def _enrichment_branch(
+    node: Callable[[AgentState], Awaitable[AgentState]],
+    keys: tuple[str, ...]
+) -> Callable[[AgentState], Awaitable[dict]]:
+    """
+    Wrap an enrichment node so it only writes ``keys`` back to the graph.
     
+    Parallel branches may not write the same non-reducer key in one step,
+    so each branch reports only what it owns (``metadata`` is merged by its
+    reducer).
+    """
+    async def branch(state: AgentState) -> dict:
+        updated_state = await node(state)
+        return {key: updated_state[key] for key in keys if key in updated_state}
+    
+    branch.__name__ = node.__name__
+    return branch
+
+
+@functools.lru_cache(maxsize=None)
+def _get_agent(module_name: str, class_name: str):
+    """
+    Import and instantiate an agent once, then reuse it for every job.
+    
+    Agents keep no per-job state on the instance, so sharing them lets
+    their clients (storage, embedding model) be created once. Imports stay
+    lazy because the agent modules import ``AgentState`` from here.
+    """
+    module = importlib.import_module(module_name)
+    return getattr(module, class_name)()
+
+
+# Node functions are async: blocking agent work runs in worker threads so
+# concurrent jobs share the event loop instead of each pinning a thread.
+async def ingestion_node(state: AgentState) -> AgentState:
+    """Ingestion Agent node - handles file upload and format detection."""
     logger.info(f"Ingestion agent processing job {state['job_id']}")
-    _update_job_status(state['job_id'], "ingesting")
+    await asyncio.to_thread(_update_job_status, state['job_id'], "ingesting")
     
     # Use IngestionAgent to process
-    agent = IngestionAgent()
-    updated_state = agent.process(state)
+    agent = _get_agent("app.agents.ingestion_agent", "IngestionAgent")
+    updated_state = await asyncio.to_thread(agent.process, state)
     
     return updated_state
 
 
-def parsing_node(state: AgentState) -> AgentState:
+async def parsing_node(state: AgentState) -> AgentState:
     """Parsing Agent node - cleans up markdown using LLM for better UI display."""
-    from app.agents.parsing_agent import ParsingAgent
-    
     logger.info(f"Parsing agent processing job {state['job_id']}")
-    _update_job_status(state['job_id'], "parsing")
+    await asyncio.to_thread(_update_job_status, state['job_id'], "parsing")
     
     # Use ParsingAgent to process
-    agent = ParsingAgent()
-    updated_state = agent.process(state)
+    agent = _get_agent("app.agents.parsing_agent", "ParsingAgent")
+    updated_state = await asyncio.to_thread(agent.process, state)
     
     return updated_state
 
 
-def question_extraction_node(state: AgentState) -> AgentState:
+async def question_extraction_node(state: AgentState) -> AgentState:
     """Question Extraction Agent node - identifies and isolates questions."""
     logger.info(f"Question extraction agent processing job {state['job_id']}")
-    _update_job_status(state['job_id'], "extracting")
+    await asyncio.to_thread(_update_job_status, state['job_id'], "extracting")
     # TODO: Implement question extraction logic
     state["status"] = "extracting"
     return state
 
 
-def markdown_validation_node(state: AgentState) -> AgentState:
+async def markdown_validation_node(state: AgentState) -> AgentState:
     """Markdown Validation Agent node - validates markdown quality using LLM."""
-    from app.agents.markdown_validation_agent import MarkdownValidationAgent
-    
     logger.info(f"Markdown validation agent processing job {state['job_id']}")
-    _update_job_status(state['job_id'], "validating")
+    await asyncio.to_thread(_update_job_status, state['job_id'], "validating")
     
     # Use MarkdownValidationAgent to process
-    agent = MarkdownValidationAgent()
-    updated_state = agent.process(state)
+    agent = _get_agent("app.agents.markdown_validation_agent", "MarkdownValidationAgent")
+    updated_state = await asyncio.to_thread(agent.process, state)
     
     return updated_state
 
 
-def classification_node(state: AgentState) -> AgentState:
+async def classification_node(state: AgentState) -> AgentState:
     """Classification Agent node - classifies questions by subject, difficulty, and other metadata."""
-    from app.agents.classification_agent import ClassificationAgent
-    
     logger.info(f"Classification agent processing job {state['job_id']}")
-    _update_job_status(state['job_id'], "classifying")
+    await asyncio.to_thread(_update_job_status, state['job_id'], "classifying")
     
     # Use ClassificationAgent to process
-    agent = ClassificationAgent()
-    updated_state = agent.process(state)
+    agent = _get_agent("app.agents.classification_agent", "ClassificationAgent")
+    updated_state = await asyncio.to_thread(agent.process, state)
     
     return updated_state
 
 
-def vectorization_node(state: AgentState) -> AgentState:
+async def vectorization_node(state: AgentState) -> AgentState:
     """Vectorization Agent node - generates embeddings for questions using pgvector."""
-    from app.agents.vectorization_agent import VectorizationAgent
-    
     logger.info(f"Vectorization agent processing job {state['job_id']}")
-    _update_job_status(state['job_id'], "vectorizing")
+    await asyncio.to_thread(_update_job_status, state['job_id'], "vectorizing")
     
     # Use VectorizationAgent to process
-    agent = VectorizationAgent()
-    updated_state = agent.process(state)
+    agent = _get_agent("app.agents.vectorization_agent", "VectorizationAgent")
+    updated_state = await asyncio.to_thread(agent.process, state)
     
     return updated_state
 
 
-def persistence_node(state: AgentState) -> AgentState:
+async def persistence_node(state: AgentState) -> AgentState:
     """Persistence Agent node - uploads images, extracts questions, persists to database."""
-    from app.agents.persistence_agent import PersistenceAgent
-    
     logger.info(f"Persistence agent processing job {state['job_id']}")
-    _update_job_status(state['job_id'], "persisting")
+    await asyncio.to_thread(_update_job_status, state['job_id'], "persisting")
     
     # Use PersistenceAgent to process
-    agent = PersistenceAgent()
-    updated_state = agent.process(state)
+    agent = _get_agent("app.agents.persistence_agent", "PersistenceAgent")
+    updated_state = await asyncio.to_thread(agent.process, state)
     
     return updated_state
 
@@ -5,12 +5,16 @@ from datetime import datetime, timezone
 from typing import Optional
 from uuid import UUID
 
+from sqlalchemy import String, column, func, update, values
 from sqlalchemy.orm import Session
 
 from app.models import Job
 
 logger = logging.getLogger(__name__)
 
+# Statuses set by complete_job / fail_job that progress updates must not overwrite
+TERMINAL_STATUSES = ("completed", "failed")
+
 
 class JobService:
     """Service for creating and updating job records."""
@@ -59,25 +63,61 @@ class JobService:
         Returns:
             Updated Job instance or None if not found
         """
-        job = db.query(Job).filter(Job.id == job_id).first()
+        updates = {"status": status}
+        
+        # Set started_at on first status change from queued
+        if status != "queued":
+            updates["started_at"] = func.coalesce(Job.started_at, func.now())
+        
+        if error_message:
+            updates["error_message"] = error_message
+        
+        job = JobService._update_returning(db, job_id, updates)
         if not job:
             logger.warning(f"Job {job_id} not found for status update")
             return None
         
-        job.status = status
+        logger.debug(f"Updated job {job_id} status to '{status}'")
+        return job
+    
+    @staticmethod
+    def bulk_update_status(db: Session, statuses: dict[str, str]) -> int:
+        """
+        Apply progress updates for many jobs in one UPDATE ... FROM (VALUES ...).
         
-        # Set started_at on first status change from queued
-        if job.started_at is None and status != "queued":
-            job.started_at = datetime.now(timezone.utc)
+        Jobs that already reached a terminal status are left untouched, so a
+        late progress write cannot overwrite a completion or failure.
         
-        if error_message:
-            job.error_message = error_message
+        Args:
+            db: Database session
+            statuses: Mapping of job UUID to new status value
+            
+        Returns:
+            Number of jobs updated
+        """
+        if not statuses:
+            return 0
         
+        v = values(
+            column("id", Job.id.type),
+            column("status", String(50)),
+            name="v",
+        ).data([(UUID(str(job_id)), status) for job_id, status in statuses.items()])
+        stmt = (
+            update(Job)
+            .where(Job.id == v.c.id)
+            .where(Job.status.notin_(TERMINAL_STATUSES))
+            .values(
+                status=v.c.status,
+                started_at=func.coalesce(Job.started_at, func.now()),
+            )
+            .execution_options(synchronize_session=False)
+        )
+        result = db.execute(stmt)
         db.commit()
-        db.refresh(job)
         
-        logger.debug(f"Updated job {job_id} status to '{status}'")
-        return job
+        logger.debug(f"Updated status of {result.rowcount} jobs in one statement")
+        return result.rowcount
     
     @staticmethod
     def complete_job(
@@ -98,20 +138,50 @@ class JobService:
         Returns:
             Updated Job instance or None if not found
         """
-        job = db.query(Job).filter(Job.id == job_id).first()
+        job = JobService._update_returning(db, job_id, {
+            "status": "completed",
+            "document_id": document_id,
+            "question_count": question_count,
+            "completed_at": datetime.now(timezone.utc),
+        })
         if not job:
             logger.warning(f"Job {job_id} not found for completion")
             return None
         
-        job.status = "completed"
-        job.document_id = document_id
-        job.question_count = question_count
-        job.completed_at = datetime.now(timezone.utc)
+        logger.info(f"Job {job_id} completed: document_id={document_id}, questions={question_count}")
+        return job
+    
+    @staticmethod
+    def record_results(
+        db: Session,
+        job_id: str | UUID,
+        document_id: Optional[UUID] = None,
+        question_count: int = 0
+    ) -> Optional[Job]:
+        """
+        Publish persisted results on a job that is still running.
         
-        db.commit()
-        db.refresh(job)
+        Lets clients polling the job see the document before the remaining
+        enrichment steps finish. Status is left unchanged.
         
-        logger.info(f"Job {job_id} completed: document_id={document_id}, questions={question_count}")
+        Args:
+            db: Database session
+            job_id: Job UUID
+            document_id: Created document UUID
+            question_count: Number of questions extracted
+            
+        Returns:
+            Updated Job instance or None if not found
+        """
+        job = JobService._update_returning(db, job_id, {
+            "document_id": document_id,
+            "question_count": question_count,
+        })
+        if not job:
+            logger.warning(f"Job {job_id} not found for results update")
+            return None
+        
+        logger.debug(f"Job {job_id} results recorded: document_id={document_id}, questions={question_count}")
         return job
     
     @staticmethod
@@ -131,19 +201,53 @@ class JobService:
         Returns:
             Updated Job instance or None if not found
         """
-        job = db.query(Job).filter(Job.id == job_id).first()
+        job = JobService._update_returning(db, job_id, {
+            "status": "failed",
+            "error_message": error_message,
+            "completed_at": datetime.now(timezone.utc),
+        })
         if not job:
             logger.warning(f"Job {job_id} not found for failure update")
             return None
         
-        job.status = "failed"
-        job.error_message = error_message
-        job.completed_at = datetime.now(timezone.utc)
+        logger.error(f"Job {job_id} failed: {error_message}")
+        return job
+    
+    @staticmethod
+    def _update_returning(db: Session, job_id: str | UUID, updates: dict) -> Optional[Job]:
+        """
+        Apply ``updates`` to a job in a single UPDATE ... RETURNING and commit.
         
-        db.commit()
-        db.refresh(job)
+        Replaces the SELECT + commit + refresh round-trips of a
+        read-modify-write. The row lock is taken by the UPDATE itself.
         
-        logger.error(f"Job {job_id} failed: {error_message}")
+        Args:
+            db: Database session
+            job_id: Job UUID
+            updates: Column values (or SQL expressions) to set
+            
+        Returns:
+            Updated Job instance, with the RETURNING values loaded and not
+            expired by the commit, or None if not found
+        """
+        stmt = (
+            update(Job)
+            .where(Job.id == job_id)
+            .values(**updates)
+            .returning(Job)
+            .execution_options(synchronize_session=False, populate_existing=True)
+        )
+        job = db.execute(stmt).scalar_one_or_none()
+        
+        # Keep the RETURNING values loaded. With the session's default
+        # expire_on_commit, commit() would expire them, so the caller's first
+        # attribute access would SELECT again (or fail once the session closed).
+        expire_on_commit = db.expire_on_commit
+        db.expire_on_commit = False
+        try:
+            db.commit()
+        finally:
+            db.expire_on_commit = expire_on_commit
         return job
     
     @staticmethod
@@ -1,5 +1,7 @@
 """Template builder for dynamically constructing prompts from YAML config files."""
 
+import copy
+import functools
 import logging
 import os
 from pathlib import Path
@@ -7,11 +9,32 @@ from typing import Dict, Any, Optional, List
 import re
 import yaml
 
+try:
+    from yaml import CSafeLoader as _SafeLoader  # libyaml C parser
+except ImportError:  # PyYAML built without libyaml
+    from yaml import SafeLoader as _SafeLoader
+
+from app.cache import LRUCache
+
 logger = logging.getLogger(__name__)
 
 # Default prompts directory (relative to project root)
 PROMPTS_DIR = Path(__file__).parent.parent.parent / "prompts"
 
+# {variable} placeholder, as used by config values and substitution
+_VAR_RE = re.compile(r'\{(\w+)\}')
+
+# Parsed prompt files keyed by path, stored as (mtime_ns, size, template
+# builder with assembled prompt and schema precomputed). mtime + size detect
+# edits without re-reading the file.
+_config_cache = LRUCache(maxsize=128)
+
+
+@functools.lru_cache(maxsize=None)
+def _header(key: str) -> str:
+    """Section label for a config key, e.g. "output_constraints" -> "Output Constraints"."""
+    return key.replace('_', ' ').title()
+
 
 class PromptTemplateBuilder:
     """Dynamically builds prompts from config structure with variable substitution."""
@@ -54,6 +77,11 @@ class PromptTemplateBuilder:
         self.config = config
         self.variables = variables or {}
         self.parts: List[str] = []
+        # Precomputed by _load_template for the cached per-file template only;
+        # builders handed to callers leave these unset so config edits apply
+        self._assembled: Optional[str] = None
+        self._required_vars: Optional[List[str]] = None
+        self._schema: Optional[Dict[str, Dict[str, Any]]] = None
     
     @classmethod
     def from_file(
@@ -73,6 +101,23 @@ class PromptTemplateBuilder:
         Returns:
             PromptTemplateBuilder: Initialized builder with config from file
             
+        Raises:
+            FileNotFoundError: If prompt file not found
+            yaml.YAMLError: If YAML parsing fails
+        """
+        template = cls._load_template(name, prompts_dir)
+        
+        # Copy so callers mutating their builder's config can't alter the cache
+        return cls(copy.deepcopy(template.config), variables or {})
+    
+    @classmethod
+    def _load_template(cls, name: str, prompts_dir: Optional[Path] = None) -> 'PromptTemplateBuilder':
+        """
+        Return the cached, variable-free builder for a prompt file.
+        
+        The file is parsed, assembled and its variable schema derived once per
+        file version; callers must not mutate the returned builder.
+        
         Raises:
             FileNotFoundError: If prompt file not found
             yaml.YAMLError: If YAML parsing fails
@@ -80,17 +125,31 @@ class PromptTemplateBuilder:
         dir_path = prompts_dir or PROMPTS_DIR
         file_path = dir_path / f"{name}.yaml"
         
-        if not file_path.exists():
+        try:
+            stat = file_path.stat()
+        except FileNotFoundError:
             raise FileNotFoundError(f"Prompt file not found: {file_path}")
         
+        cache_key = str(file_path)
+        cached = _config_cache.get(cache_key)
+        if cached and cached[0] == stat.st_mtime_ns and cached[1] == stat.st_size:
+            return cached[2]
+        
         with open(file_path, 'r', encoding='utf-8') as f:
-            config = yaml.safe_load(f)
+            config = yaml.load(f, Loader=_SafeLoader)
         
         if not config:
             raise ValueError(f"Empty or invalid YAML config in: {file_path}")
         
+        # Section formatting and the schema are variable-independent: do them
+        # once per file version
+        template = cls(config)
+        template._assembled = template.assemble()
+        template._required_vars = template.get_required_variables()
+        template._schema = template.get_variable_schema()
+        _config_cache.set(cache_key, (stat.st_mtime_ns, stat.st_size, template))
         logger.debug(f"Loaded prompt config from: {file_path}")
-        return cls(config, variables or {})
+        return template
     
     @classmethod
     def build_from_file(
@@ -127,12 +186,13 @@ class PromptTemplateBuilder:
             # Returns complete prompt with all variables replaced
             ```
         """
-        # Load from file and create builder
-        builder = cls.from_file(
-            name=name,
-            variables=variables,
-            prompts_dir=prompts_dir
-        )
+        # Render straight from the cached template: this builder never leaves
+        # the method, so its config needn't be copied and nothing is recomputed
+        template = cls._load_template(name, prompts_dir)
+        builder = cls(template.config, variables or {})
+        builder._assembled = template._assembled
+        builder._required_vars = template._required_vars
+        builder._schema = template._schema
         
         # Validate variables if schema exists
         schema = builder.get_variable_schema()
@@ -154,10 +214,28 @@ class PromptTemplateBuilder:
         Returns:
             str: Complete formatted prompt
         """
+        return self.render(self.assemble())
+    
+    def assemble(self) -> str:
+        """
+        Format all config sections, leaving {variable} placeholders in place.
+        
+        The result depends only on the config and can be passed to render()
+        for each set of variables. build_from_file() reuses one assembled text
+        per file version; other builders re-assemble on each call so edits to
+        their config take effect.
+        
+        Returns:
+            str: Formatted prompt with unsubstituted placeholders
+        """
+        if self._assembled is not None:
+            return self._assembled
+        
         self.parts = []
         
         # Process each section in config
-        for key, value in self.config.items():
+        for key in self._section_order():
+            value = self.config[key]
             if key in self.EXCLUDED_SECTIONS:
                 continue
             
@@ -178,12 +256,42 @@ class PromptTemplateBuilder:
                 self._add_generic_section(key, value)
         
         # Join all parts
-        prompt = "\n\n".join(self.parts)
+        return "\n\n".join(self.parts)
+    
+    def _section_order(self) -> List[str]:
+        """
+        Order config keys for output.
         
-        # Apply variable substitution
-        prompt = self._substitute_variables(prompt)
+        Keys listed in ``template_config.cache_prefix_sections`` come first, in
+        that order, followed by the remaining keys in declaration order. Keeping
+        static sections ahead of variable-bearing ones gives every rendered
+        prompt the same leading bytes, which provider-side prompt caching keys on.
+        """
+        template_config = self.config.get("template_config") or {}
+        prefix = [
+            key for key in template_config.get("cache_prefix_sections") or []
+            if key in self.config
+        ]
+        if not prefix:
+            return list(self.config)
+        
+        prefix_set = set(prefix)
+        return prefix + [key for key in self.config if key not in prefix_set]
+    
+    def render(self, assembled: str) -> str:
+        """
+        Substitute this builder's variables into the output of assemble().
         
-        return prompt
+        Args:
+            assembled: Prompt text returned by assemble() for the same config
+            
+        Returns:
+            str: Complete prompt with variables replaced
+            
+        Raises:
+            ValueError: If required variables are missing
+        """
+        return self._substitute_variables(assembled)
     
     def _add_string_section(self, key: str, value: str) -> None:
         """Add a string section to the prompt."""
@@ -192,7 +300,7 @@ class PromptTemplateBuilder:
             formatted = self.DEFAULT_FORMATTERS[key](value)
         else:
             # Default: use key as label
-            formatted = f"{key.replace('_', ' ').title()}: {value}"
+            formatted = f"{_header(key)}: {value}"
         
         # Variable substitution is handled in the final _substitute_variables call
         self.parts.append(formatted)
@@ -203,33 +311,31 @@ class PromptTemplateBuilder:
             return
         
         # Format section header
-        header = key.replace('_', ' ').title()
+        header = _header(key)
         self.parts.append(f"{header}:")
         
         # Add each item as a bullet point
         # Variable substitution is handled in the final _substitute_variables call
-        for item in value:
-            self.parts.append(f"  - {item}")
+        self.parts.extend(f"  - {item}" for item in value)
     
     def _add_dict_section(self, key: str, value: Dict[str, Any]) -> None:
         """Add a nested dictionary section."""
-        header = key.replace('_', ' ').title()
-        self.parts.append(f"{header}:")
+        append = self.parts.append
+        header = _header(key)
+        append(f"{header}:")
         
         # Variable substitution is handled in the final _substitute_variables call
         for sub_key, sub_value in value.items():
+            sub_header = _header(sub_key)
             if isinstance(sub_value, list):
-                self.parts.append(f"  {sub_key.replace('_', ' ').title()}:")
-                for item in sub_value:
-                    self.parts.append(f"    - {item}")
-            elif isinstance(sub_value, str):
-                self.parts.append(f"  {sub_key.replace('_', ' ').title()}: {sub_value}")
+                append(f"  {sub_header}:")
+                self.parts.extend(f"    - {item}" for item in sub_value)
             else:
-                self.parts.append(f"  {sub_key.replace('_', ' ').title()}: {sub_value}")
+                append(f"  {sub_header}: {sub_value}")
     
     def _add_generic_section(self, key: str, value: Any) -> None:
         """Add a generic section (non-string, non-list, non-dict)."""
-        header = key.replace('_', ' ').title()
+        header = _header(key)
         self.parts.append(f"{header}: {value}")
     
     def _substitute_variables(self, text: str) -> str:
@@ -277,14 +383,11 @@ class PromptTemplateBuilder:
                     f"Provided: {', '.join(sorted(provided))}"
                 )
         
-        # Replace only the known variables using explicit string replacement
-        # This avoids issues with curly braces in content (JSON, LaTeX, etc.)
-        result = text
-        for var_name, var_value in self.variables.items():
-            placeholder = "{" + var_name + "}"
-            result = result.replace(placeholder, str(var_value))
-        
-        return result
+        # Replace only the known variables, in a single pass over the text.
+        # Unknown {...} (JSON, LaTeX, etc.) is left untouched, and substituted
+        # values are never re-scanned for placeholders.
+        values = {name: str(value) for name, value in self.variables.items()}
+        return _VAR_RE.sub(lambda m: values.get(m.group(1), m.group(0)), text)
     
     def get_required_variables(self) -> List[str]:
         """
@@ -293,35 +396,53 @@ class PromptTemplateBuilder:
         Returns:
             List[str]: Sorted list of variable names
         """
-        variables = set()
-        config_text = str(self.config)
-        
-        # Find all {variable} patterns
-        pattern = r'\{(\w+)\}'
-        matches = re.findall(pattern, config_text)
-        variables.update(matches)
+        if self._required_vars is not None:
+            return list(self._required_vars)
         
-        return sorted(list(variables))
+        # Scan only the string keys/values instead of str() of the whole config
+        variables = set()
+        for text in self._iter_strings(self.config):
+            variables.update(_VAR_RE.findall(text))
+        return sorted(variables)
+    
+    @classmethod
+    def _iter_strings(cls, value: Any):
+        """Yield every string key and value nested in a config structure."""
+        if isinstance(value, str):
+            yield value
+        elif isinstance(value, dict):
+            for key, item in value.items():
+                if isinstance(key, str):
+                    yield key
+                yield from cls._iter_strings(item)
+        elif isinstance(value, (list, tuple)):
+            for item in value:
+                yield from cls._iter_strings(item)
     
     def get_variable_schema(self) -> Dict[str, Dict[str, Any]]:
         """
         Get variable schema from config if defined, otherwise auto-generate.
         
+        build_from_file() reuses the schema of its cached per-file template;
+        other builders derive it from their current config on each call.
+        
         Returns:
             Dict: Variable schema with metadata
         """
+        if self._schema is not None:
+            return self._schema
+        
         if "variable_schema" in self.config:
             return self.config["variable_schema"]
         
         # Auto-generate schema from detected variables
-        variables = self.get_required_variables()
         return {
             var: {
                 "required": True,
                 "description": f"Variable {var}",
                 "type": "string"
             }
-            for var in variables
+            for var in self.get_required_variables()
         }
     
     def validate_variables(self, variables: Optional[Dict[str, Any]] = None) -> tuple[bool, List[str]]:
@@ -1,13 +1,18 @@
 """Search service for semantic similarity search over questions using pgvector."""
 
 import logging
+import math
+import uuid
+from concurrent.futures import ThreadPoolExecutor
 from typing import Optional
 
-from sqlalchemy.orm import Session
+from sqlalchemy import func, select, true
+from sqlalchemy.orm import Session, defer
 
 from app.database import SessionLocal
 from app.models import Question
-from app.services.embedding_service import EmbeddingService
+from app.services.embedding_service import EmbeddingService, get_default_embedding_service
+from app.services.similarity_cache import search_result_cache
 
 logger = logging.getLogger(__name__)
 
@@ -15,8 +20,10 @@ logger = logging.getLogger(__name__)
 class SearchService:
     """Service for semantic search over questions using pgvector.
     
-    Provides user-scoped similarity search using cosine distance
-    on question embeddings stored in PostgreSQL with pgvector.
+    Provides user-scoped similarity search over question embeddings
+    stored in PostgreSQL with pgvector. Stored embeddings are unit-length
+    (both providers normalize), so cosine similarity is ranked with the
+    cheaper inner-product operator.
     
     All searches are filtered by user_id to ensure data isolation.
     """
@@ -28,7 +35,7 @@ class SearchService:
         Args:
             embedding_service: Optional pre-configured embedding service
         """
-        self.embedding_service = embedding_service or EmbeddingService()
+        self.embedding_service = embedding_service or get_default_embedding_service()
     
     def search_questions(
         self,
@@ -89,40 +96,7 @@ class SearchService:
             logger.info(f"Generating embedding for query: '{query[:50]}...'")
             query_embedding = self.embedding_service.embed_text(query.strip())
             
-            # Step 2: Query with cosine distance
-            # pgvector's <=> operator returns cosine distance (0 = identical, 2 = opposite)
-            # We convert to similarity: 1 - distance (for normalized vectors, distance is 0-1)
-            distance = Question.embedding.cosine_distance(query_embedding)
-            similarity = (1 - distance).label('similarity')
-            
-            # Step 3: Build and execute query with user filter
-            results = db.query(Question, similarity).filter(
-                Question.user_id == user_id,
-                Question.is_embedded == True,
-                Question.embedding.isnot(None)
-            ).order_by(
-                distance  # Ascending - closest (most similar) first
-            ).limit(limit).all()
-            
-            logger.info(f"Found {len(results)} results for user {user_id}")
-            
-            # Step 4: Format results and filter by similarity threshold
-            formatted_results = []
-            for question, sim_score in results:
-                # Convert similarity score to float
-                sim_float = float(sim_score) if sim_score is not None else 0.0
-                
-                # Skip results below threshold
-                if sim_float < min_similarity:
-                    continue
-                
-                formatted_results.append({
-                    "question": question.to_dict(),
-                    "similarity": round(sim_float, 4)
-                })
-            
-            logger.info(f"Returning {len(formatted_results)} results above similarity threshold {min_similarity}")
-            return formatted_results
+            return self._search_by_embedding(query_embedding, user_id, limit, min_similarity, db)
             
         except Exception as e:
             logger.error(f"Error during search: {str(e)}", exc_info=True)
@@ -132,6 +106,115 @@ class SearchService:
             if should_close_db:
                 db.close()
     
+    def search_questions_batch(
+        self,
+        queries: list[str],
+        user_id: str,
+        limit: int = 10,
+        min_similarity: float = 0.3,
+        max_workers: int = 8
+    ) -> list[list[dict]]:
+        """
+        Run several searches for one user.
+        
+        All queries are embedded in a single embed_texts() call (duplicates
+        once), then the pgvector queries run concurrently, each on its own
+        session.
+        
+        Args:
+            queries: Natural language search queries
+            user_id: User ID to scope the search (required for data isolation)
+            limit: Maximum number of results per query (default: 10, max: 50)
+            min_similarity: Minimum similarity threshold 0-1 (default: 0.3)
+            max_workers: Maximum concurrent database queries
+            
+        Returns:
+            One result list per query, in input order (empty for blank queries)
+        """
+        if not user_id:
+            logger.error("user_id is required for search")
+            raise ValueError("user_id is required for search")
+        
+        limit = min(max(1, limit), 50)
+        min_similarity = max(0.0, min(1.0, min_similarity))
+        
+        texts = list(dict.fromkeys(q.strip() for q in queries if q and q.strip()))
+        if not texts:
+            return [[] for _ in queries]
+        
+        logger.info(f"Generating embeddings for {len(texts)} queries")
+        embeddings = dict(zip(texts, self.embedding_service.embed_texts(texts)))
+        
+        def _run(text: str) -> list[dict]:
+            db = SessionLocal()
+            try:
+                return self._search_by_embedding(embeddings[text], user_id, limit, min_similarity, db)
+            finally:
+                db.close()
+        
+        try:
+            with ThreadPoolExecutor(max_workers=max(1, min(max_workers, len(texts)))) as pool:
+                results = dict(zip(texts, pool.map(_run, texts)))
+        except Exception as e:
+            logger.error(f"Error during batch search: {str(e)}", exc_info=True)
+            raise
+        
+        return [results[q.strip()] if q and q.strip() else [] for q in queries]
+    
+    def _search_by_embedding(
+        self,
+        query_embedding: list[float],
+        user_id: str,
+        limit: int,
+        min_similarity: float,
+        db: Session
+    ) -> list[dict]:
+        """Run steps 2-4 of search_questions for an already embedded query."""
+        # Reuse results of a recent near-identical query by this user
+        cache_params = (limit, min_similarity)
+        cached = search_result_cache.get(user_id, cache_params, query_embedding)
+        if cached is not None:
+            logger.info(f"Returning {len(cached)} cached results for user {user_id}")
+            return cached
+
+        # Step 2: Query with negative inner product
+        # pgvector's <#> operator returns -(a . b); for unit vectors that is
+        # -cosine similarity, without <=>'s per-row norm computations
+        distance = Question.embedding.max_inner_product(_unit_vector(query_embedding))
+        similarity = (-distance).label('similarity')
+
+        # Step 3: Build and execute query with user filter and threshold
+        # The embedding column is only needed inside Postgres for ranking;
+        # don't ship it back and deserialize it for every hit.
+        # Rows below min_similarity are dropped in SQL; since they are the
+        # least similar, this returns the same rows as filtering the top-k.
+        results = db.query(Question, similarity).options(
+            defer(Question.embedding)
+        ).filter(
+            Question.user_id == user_id,
+            Question.is_embedded == True,
+            Question.embedding.isnot(None),
+            distance <= -min_similarity
+        ).order_by(
+            distance  # Ascending - closest (most similar) first
+        ).limit(limit).all()
+
+        logger.info(f"Found {len(results)} results for user {user_id}")
+
+        # Step 4: Format results
+        formatted_results = [
+            {
+                "question": question.to_dict(),
+                "similarity": round(float(sim_score), 4)
+            }
+            for question, sim_score in results
+        ]
+
+        search_result_cache.put(user_id, cache_params, query_embedding, formatted_results)
+
+        logger.info(f"Returning {len(formatted_results)} results above similarity threshold {min_similarity}")
+        return formatted_results
+    
     def find_similar_to_question(
         self,
         question_id: str,
@@ -155,34 +238,33 @@ class SearchService:
         Returns:
             List of similar questions with similarity scores
         """
-        import uuid
-        
         should_close_db = db is None
         if db is None:
             db = SessionLocal()
         
         try:
-            # Get the source question
-            source_question = db.query(Question).filter(
+            # Resolve the source embedding in the same statement as the
+            # neighbour search (one round trip). If the question is missing,
+            # belongs to another user or has no embedding, the join is empty.
+            source = select(
+                Question.id.label("id"),
+                Question.embedding.label("embedding")
+            ).where(
                 Question.id == uuid.UUID(question_id),
-                Question.user_id == user_id
-            ).first()
-            
-            if not source_question:
-                logger.warning(f"Question not found: {question_id}")
-                return []
-            
-            if not source_question.embedding:
-                logger.warning(f"Question has no embedding: {question_id}")
-                return []
+                Question.user_id == user_id,
+                Question.embedding.isnot(None)
+            ).cte("source")
             
-            # Use the question's embedding for search
-            source_embedding = source_question.embedding
-            distance = Question.embedding.cosine_distance(source_embedding)
-            similarity = (1 - distance).label('similarity')
+            # Stored embeddings are unit-length: -(a <#> b) is cosine similarity
+            distance = Question.embedding.max_inner_product(source.c.embedding)
+            similarity = (-distance).label('similarity')
             
             # Build query
-            query_builder = db.query(Question, similarity).filter(
+            query_builder = db.query(Question, similarity).options(
+                defer(Question.embedding)
+            ).join(
+                source, true()
+            ).filter(
                 Question.user_id == user_id,
                 Question.is_embedded == True,
                 Question.embedding.isnot(None)
@@ -190,10 +272,13 @@ class SearchService:
             
             # Optionally exclude the source question
             if exclude_self:
-                query_builder = query_builder.filter(Question.id != source_question.id)
+                query_builder = query_builder.filter(Question.id != source.c.id)
             
             results = query_builder.order_by(distance).limit(limit).all()
             
+            if not results:
+                logger.warning(f"No similar questions for {question_id} (missing, not embedded, or no neighbours)")
+            
             # Format results
             return [
                 {
@@ -227,14 +312,13 @@ class SearchService:
             db = SessionLocal()
         
         try:
-            total_questions = db.query(Question).filter(
+            # Both counts in one scan: count(*) FILTER (WHERE is_embedded)
+            total_questions, embedded_questions = db.query(
+                func.count(Question.id),
+                func.count(Question.id).filter(Question.is_embedded == True)
+            ).filter(
                 Question.user_id == user_id
-            ).count()
-            
-            embedded_questions = db.query(Question).filter(
-                Question.user_id == user_id,
-                Question.is_embedded == True
-            ).count()
+            ).one()
             
             return {
                 "user_id": user_id,
@@ -249,3 +333,9 @@ class SearchService:
         finally:
             if should_close_db:
                 db.close()
+
+
+def _unit_vector(vector: list[float]) -> list[float]:
+    """Scale ``vector`` to unit length so inner products equal cosine similarity."""
+    norm = math.sqrt(sum(x * x for x in vector))
+    return [x / norm for x in vector] if norm else vector
@@ -0,0 +1,102 @@
+"""Per-user cache of recent search results, matched by query embedding."""
+
+import copy
+import threading
+import time
+from typing import Hashable, Optional, Sequence
+
+import numpy as np
+
+from app.cache import LRUCache
+from app.config import settings
+
+
+class SimilarityCache:
+    """Reuse search results for queries whose embeddings are nearly identical.
+
+    Each user keeps up to ``max_entries`` recent ``(query vector, params,
+    results)`` entries. A lookup compares the new query vector against the
+    user's live entries with one matrix-vector product and returns the
+    results of the closest one if its cosine similarity is at least
+    ``threshold`` and it was stored with the same search parameters.
+
+    Exact repeats always hit (similarity 1.0). Entries expire after ``ttl``
+    seconds; ``invalidate()`` drops a user's entries when their questions
+    change. A ``max_entries`` of 0 disables the cache.
+    """
+
+    def __init__(
+        self,
+        max_entries: int = 64,
+        threshold: float = 0.97,
+        ttl: float = 60.0,
+        max_users: int = 1024,
+    ):
+        self.max_entries = max_entries
+        self.threshold = threshold
+        self.ttl = ttl
+
+        # user_id -> list of (unit vector, params, results, expires_at), oldest first
+        self._users = LRUCache(maxsize=max_users if max_entries > 0 else 0)
+        self._lock = threading.Lock()
+
+    def get(
+        self, user_id: str, params: Hashable, query_vector: Sequence[float]
+    ) -> Optional[list[dict]]:
+        """Return cached results for a near-identical query, or None."""
+        if self.max_entries <= 0:
+            return None
+
+        now = time.monotonic()
+        with self._lock:
+            entries = [
+                entry for entry in self._users.get(user_id, [])
+                if entry[1] == params and entry[3] > now
+            ]
+        if not entries:
+            return None
+
+        scores = np.stack([entry[0] for entry in entries]) @ _unit(query_vector)
+        best = int(np.argmax(scores))
+        if scores[best] < self.threshold:
+            return None
+        return copy.deepcopy(entries[best][2])
+
+    def put(
+        self,
+        user_id: str,
+        params: Hashable,
+        query_vector: Sequence[float],
+        results: list[dict],
+    ) -> None:
+        """Store ``results`` for a query, evicting the user's oldest entry if full."""
+        if self.max_entries <= 0:
+            return
+
+        entry = (_unit(query_vector), params, copy.deepcopy(results), time.monotonic() + self.ttl)
+        with self._lock:
+            now = time.monotonic()
+            entries = [e for e in self._users.get(user_id, []) if e[3] > now]
+            entries.append(entry)
+            self._users.set(user_id, entries[-self.max_entries:])
+
+    def invalidate(self, user_id: str) -> None:
+        """Drop all cached results for ``user_id``."""
+        with self._lock:
+            self._users.pop(user_id)
+
+
+def _unit(vector: Sequence[float]) -> np.ndarray:
+    """Return ``vector`` as an L2-normalized float32 array."""
+    arr = np.asarray(vector, dtype=np.float32)
+    norm = np.linalg.norm(arr)
+    return arr / norm if norm else arr
+
+
+# Shared by all SearchService instances (one is created per request) and
+# invalidated by the vectorization agent when a user's questions change.
+search_result_cache = SimilarityCache(
+    max_entries=settings.search_cache_size,
+    threshold=settings.search_cache_similarity,
+    ttl=settings.search_cache_ttl_seconds,
+)
@@ -0,0 +1,79 @@
+"""Write-behind queue that coalesces job progress updates into batched UPDATEs."""
+
+import logging
+import threading
+import time
+
+from app.config import settings
+from app.database import SessionLocal
+from app.services.job_service import JobService
+
+logger = logging.getLogger(__name__)
+
+
+class StatusWriter:
+    """Collect job status updates and write them in one statement per interval.
+
+    ``submit()`` returns immediately. A background thread wakes on the first
+    pending update, waits ``flush_interval`` seconds so updates from other
+    jobs can join, then writes the latest status per job through
+    ``JobService.bulk_update_status``. Only progress statuses should go
+    through here; completion and failure are written directly.
+    """
+
+    def __init__(self, flush_interval: float = 0.05):
+        self.flush_interval = flush_interval
+
+        self._pending: dict[str, str] = {}
+        self._lock = threading.Lock()
+        self._wakeup = threading.Event()
+        self._thread = None
+
+    def submit(self, job_id: str, status: str) -> None:
+        """Queue ``status`` for ``job_id``; a newer status replaces a pending one."""
+        with self._lock:
+            self._pending[str(job_id)] = status
+            if self._thread is None or not self._thread.is_alive():
+                self._thread = threading.Thread(
+                    target=self._run, name="job-status-writer", daemon=True
+                )
+                self._thread.start()
+        self._wakeup.set()
+
+    def flush(self) -> None:
+        """Write all pending updates now."""
+        with self._lock:
+            pending, self._pending = self._pending, {}
+        if not pending:
+            return
+
+        db = None
+        try:
+            db = SessionLocal()
+            JobService.bulk_update_status(db, pending)
+        except Exception as e:
+            # Progress updates are advisory; the final status is written directly
+            logger.warning("Failed to write %d job status updates: %s", len(pending), e)
+        finally:
+            if db:
+                db.close()
+
+    def _run(self) -> None:
+        while True:
+            self._wakeup.wait()
+            time.sleep(self.flush_interval)
+            self._wakeup.clear()
+            self.flush()
+
+
+_writer = None
+_writer_lock = threading.Lock()
+
+
+def get_status_writer() -> StatusWriter:
+    """Return (or create) the process-wide status writer."""
+    global _writer
+    with _writer_lock:
+        if _writer is None:
+            _writer = StatusWriter(flush_interval=settings.job_status_flush_ms / 1000)
+        return _writer
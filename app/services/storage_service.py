@@ -2,15 +2,35 @@
 
 import logging
 import os
+import re
+import zipfile
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from datetime import datetime, timedelta, timezone
-from pathlib import Path
-from typing import Optional, Tuple
+from typing import BinaryIO, Optional, Tuple
 from google.cloud import storage
 from google.cloud.exceptions import GoogleCloudError, NotFound
+from app.cache import LRUCache
 from app.config import settings
 
 logger = logging.getLogger(__name__)
 
+# Query parameters that mark a URL as signed (V4 X-Goog-* or legacy V2 Signature=)
+_SIGNED_URL_RE = re.compile(r"X-Goog-Algorithm|X-Goog-Signature|[?&]Signature=")
+
+# File extension -> content type for uploads and served images
+_CONTENT_TYPES = {
+    ".pdf": "application/pdf",
+    ".doc": "application/msword",
+    ".docx": "application/vnd.openxmlformats-officedocument.wordprocessingml.document",
+    ".txt": "text/plain",
+    ".jpg": "image/jpeg",
+    ".jpeg": "image/jpeg",
+    ".png": "image/png",
+    ".gif": "image/gif",
+    ".xls": "application/vnd.ms-excel",
+    ".xlsx": "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
+}
+
 
 class StorageService:
     """Service for handling Google Cloud Storage operations."""
@@ -23,6 +43,14 @@ class StorageService:
         self.client = storage.Client(project=settings.google_cloud_project_id)
         self.bucket_name = settings.google_cloud_storage_bucket
         self.bucket = self.client.bucket(self.bucket_name)
+        
+        # Processed images are written once per job and never modified, so
+        # their bytes can be served from memory on repeat requests. Images can
+        # be several MB, so the cache is bounded by total bytes as well
+        self._image_cache = LRUCache(
+            maxsize=settings.image_cache_size,
+            maxbytes=settings.image_cache_max_mb * 1024 * 1024,
+        )
 
     def upload_document(
         self, file_content: bytes, filename: str, user_id: str
@@ -77,8 +105,7 @@ class StorageService:
                 raise ValueError("Generated URL does not contain query parameters (not a signed URL)")
             
             # Check for signed URL indicators
-            has_signature = any(param in url for param in ['X-Goog-Algorithm', 'X-Goog-Signature', 'Signature'])
-            if not has_signature:
+            if not _SIGNED_URL_RE.search(url):
                 raise ValueError("Generated URL does not appear to be a signed URL")
             
             logger.info(f"Generated signed URL successfully for {blob_path}")
@@ -103,20 +130,8 @@ class StorageService:
         Returns:
             str: Content type
         """
-        extension = Path(filename).suffix.lower()
-        content_types = {
-            ".pdf": "application/pdf",
-            ".doc": "application/msword",
-            ".docx": "application/vnd.openxmlformats-officedocument.wordprocessingml.document",
-            ".txt": "text/plain",
-            ".jpg": "image/jpeg",
-            ".jpeg": "image/jpeg",
-            ".png": "image/png",
-            ".gif": "image/gif",
-            ".xls": "application/vnd.ms-excel",
-            ".xlsx": "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
-        }
-        return content_types.get(extension, "application/octet-stream")
+        extension = os.path.splitext(filename)[1].lower()
+        return _CONTENT_TYPES.get(extension, "application/octet-stream")
 
     def document_exists(self, filename: str, user_id: str) -> bool:
         """
@@ -156,6 +171,50 @@ class StorageService:
             GoogleCloudError: If upload fails
             ValueError: If parameters are invalid
         """
+        blob_path, app_url = self._image_location(filename, user_id, job_id)
+        
+        # Create blob and upload
+        blob = self.bucket.blob(blob_path)
+        
+        # Upload file content
+        blob.upload_from_string(file_content, content_type=self._get_content_type(filename))
+        
+        logger.info(f"Uploaded image to GCS: {blob_path}")
+        return app_url
+
+    def _upload_image_stream(
+        self, fileobj: BinaryIO, size: int, filename: str, user_id: str, job_id: str
+    ) -> str:
+        """
+        Upload an image from a file-like object; see upload_image_public.
+
+        Args:
+            fileobj: Readable binary stream positioned at the image start
+            size: Number of bytes to read from the stream
+            filename: The image filename
+            user_id: The user ID to organize images
+            job_id: The job ID for grouping related images
+
+        Returns:
+            str: Full application URL for serving the image
+        """
+        blob_path, app_url = self._image_location(filename, user_id, job_id)
+        self.bucket.blob(blob_path).upload_from_file(
+            fileobj, size=size, content_type=self._get_content_type(filename)
+        )
+        logger.info(f"Uploaded image to GCS: {blob_path}")
+        return app_url
+
+    def _image_location(self, filename: str, user_id: str, job_id: str) -> Tuple[str, str]:
+        """
+        Validate image parameters and build its blob path and application URL.
+
+        Returns:
+            Tuple of (blob_path, app_url)
+
+        Raises:
+            ValueError: If parameters are invalid
+        """
         if not user_id or not user_id.strip():
             raise ValueError("user_id cannot be empty")
         
@@ -168,20 +227,12 @@ class StorageService:
         # Construct the blob path: processed/{user_id}/{job_id}/images/{filename}
         blob_path = f"processed/{user_id.strip()}/{job_id.strip()}/images/{filename.strip()}"
         
-        # Create blob and upload
-        blob = self.bucket.blob(blob_path)
-        
-        # Upload file content
-        blob.upload_from_string(file_content, content_type=self._get_content_type(filename))
-        
-        logger.info(f"Uploaded image to GCS: {blob_path}")
-        
-        # Return full application URL that serves images through our API
+        # Full application URL that serves images through our API
         # Base URL is configurable via API_BASE_URL in .env
         base_url = settings.api_base_url.rstrip('/')
         app_url = f"{base_url}/documently/api/v1/images/{user_id.strip()}/{job_id.strip()}/{filename.strip()}"
         
-        return app_url
+        return blob_path, app_url
     
     def upload_images_from_zip(
         self, zip_path: str, user_id: str, job_id: str
@@ -189,6 +240,11 @@ class StorageService:
         """
         Extract and upload all images from a ZIP file.
         
+        Uploads run concurrently (IMAGE_UPLOAD_CONCURRENCY at a time), each
+        with its own retries. Entries are streamed from the archive rather than
+        read into memory all at once. Images already stored for this job (e.g.
+        by an earlier, partially failed run) are mapped without re-uploading.
+        
         Args:
             zip_path: Path to the ZIP file
             user_id: The user ID
@@ -197,43 +253,51 @@ class StorageService:
         Returns:
             dict: Mapping of local paths to public URLs
         """
-        import zipfile
-        import os
-        
         url_mapping = {}
         
         failed_images = []
         try:
             with zipfile.ZipFile(zip_path, 'r') as zf:
-                for name in zf.namelist():
-                    # Check if it's an image file
-                    if name.lower().endswith(('.png', '.jpg', '.jpeg', '.gif', '.webp', '.svg')):
-                        # Read image content
-                        image_content = zf.read(name)
-
-                        # Get just the filename
-                        filename = os.path.basename(name)
-
-                        # Upload to GCS with per-image retry
-                        uploaded = False
-                        for attempt in range(3):
-                            try:
-                                public_url = self.upload_image_public(
-                                    image_content, filename, user_id, job_id
-                                )
-                                # Map both full path and filename to URL
-                                url_mapping[name] = public_url
-                                url_mapping[filename] = public_url
-                                logger.debug(f"Uploaded image: {name} -> {public_url}")
-                                uploaded = True
-                                break
-                            except Exception as img_err:
-                                logger.warning(
-                                    "Image upload attempt %d/3 failed for %s: %s",
-                                    attempt + 1, name, img_err,
-                                )
-                        if not uploaded:
-                            failed_images.append(name)
+                images = [
+                    info for info in zf.infolist()
+                    if info.filename.lower().endswith(('.png', '.jpg', '.jpeg', '.gif', '.webp', '.svg'))
+                ]
+
+                # One listing replaces an upload per image on re-runs
+                existing = self._stored_image_names(user_id, job_id) if images else set()
+                to_upload = []
+                for info in images:
+                    filename = os.path.basename(info.filename)
+                    if filename.strip() in existing:
+                        _, public_url = self._image_location(filename, user_id, job_id)
+                        url_mapping[info.filename] = public_url
+                        url_mapping[filename] = public_url
+                    else:
+                        to_upload.append(info)
+                if existing:
+                    logger.info(f"Skipping {len(images) - len(to_upload)} images already stored for job {job_id}")
+                images = to_upload
+
+                # Uploads are I/O-bound; the archive stays open while workers stream from it
+                if images:
+                    workers = max(1, min(settings.image_upload_concurrency, len(images)))
+                    with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="image-upload") as pool:
+                        futures = {
+                            pool.submit(
+                                self._upload_image_with_retry,
+                                zf, info, user_id, job_id
+                            ): info.filename
+                            for info in images
+                        }
+                        for future in as_completed(futures):
+                            name = futures[future]
+                            public_url = future.result()
+                            if public_url is None:
+                                failed_images.append(name)
+                                continue
+                            # Map both full path and filename to URL
+                            url_mapping[name] = public_url
+                            url_mapping[os.path.basename(name)] = public_url
 
             total = len(url_mapping) // 2
             logger.info(f"Uploaded {total} images from ZIP for job {job_id}")
@@ -244,6 +308,64 @@ class StorageService:
             logger.error(f"Error uploading images from ZIP: {str(e)}", exc_info=True)
 
         return url_mapping
+
+    def _stored_image_names(self, user_id: str, job_id: str) -> set[str]:
+        """
+        List the image filenames already stored for a job.
+
+        Args:
+            user_id: The user ID
+            job_id: The job ID
+
+        Returns:
+            set: Filenames under processed/{user_id}/{job_id}/images/ (empty if listing fails)
+        """
+        prefix = f"processed/{user_id.strip()}/{job_id.strip()}/images/"
+        try:
+            return {
+                blob.name[len(prefix):]
+                for blob in self.client.list_blobs(self.bucket, prefix=prefix)
+            }
+        except GoogleCloudError as e:
+            logger.warning(f"Could not list stored images for job {job_id}, uploading all: {e}")
+            return set()
+
+    def _upload_image_with_retry(
+        self, zf: zipfile.ZipFile, info: zipfile.ZipInfo, user_id: str, job_id: str,
+        attempts: int = 3
+    ) -> Optional[str]:
+        """
+        Upload one ZIP image entry, retrying on failure.
+
+        The entry is reopened for each attempt, since a failed upload may have
+        consumed part of the stream.
+
+        Args:
+            zf: Open ZIP archive
+            info: Archive entry for the image
+            user_id: The user ID
+            job_id: The job ID
+            attempts: Maximum upload attempts
+
+        Returns:
+            str: Application URL of the image, or None if every attempt failed
+        """
+        name = info.filename
+        filename = os.path.basename(name)
+        for attempt in range(attempts):
+            try:
+                with zf.open(info) as src:
+                    public_url = self._upload_image_stream(
+                        src, info.file_size, filename, user_id, job_id
+                    )
+                logger.debug(f"Uploaded image: {name} -> {public_url}")
+                return public_url
+            except Exception as img_err:
+                logger.warning(
+                    "Image upload attempt %d/%d failed for %s: %s",
+                    attempt + 1, attempts, name, img_err,
+                )
+        return None
     
     def get_image(
         self, user_id: str, job_id: str, filename: str
@@ -264,17 +386,17 @@ class StorageService:
         
         # Construct the blob path
         blob_path = f"processed/{user_id.strip()}/{job_id.strip()}/images/{filename.strip()}"
+        content_type = self._get_content_type(filename)
+        
+        content = self._image_cache.get(blob_path)
+        if content is not None:
+            return content, content_type
         
         try:
-            blob = self.bucket.blob(blob_path)
-            
-            if not blob.exists():
-                logger.warning(f"Image not found in GCS: {blob_path}")
-                return None, None
-            
-            # Download the image content
-            content = blob.download_as_bytes()
-            content_type = self._get_content_type(filename)
+            # Download directly; a missing blob raises NotFound, so no
+            # separate exists() round trip is needed
+            content = self.bucket.blob(blob_path).download_as_bytes()
+            self._image_cache.set(blob_path, content)
             
             logger.debug(f"Retrieved image from GCS: {blob_path}")
             return content, content_type
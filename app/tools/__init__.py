@@ -24,6 +24,7 @@ from app.tools.json_tools import parse_json_array, parse_json_object
 from app.tools.classification_tools import classify_question, classify_questions_batch
 from app.tools.search_tools import (
     search_similar_questions,
+    search_similar_questions_batch,
     find_related_questions,
     get_search_statistics,
 )
@@ -37,6 +38,7 @@ __all__ = [
     "classify_questions_batch",
     # Search tools
     "search_similar_questions",
+    "search_similar_questions_batch",
     "find_related_questions",
     "get_search_statistics",
 ]
@@ -4,20 +4,70 @@ These tools help classify educational questions by subject, difficulty,
 and other metadata using LLM-based analysis.
 """
 
+import copy
+import hashlib
 import json
 import logging
+from concurrent.futures import ThreadPoolExecutor
 from typing import Any, Optional
 
 from langchain_core.tools import tool
 
+from app.cache import LRUCache
+from app.config import settings
 from app.services.prompt_template_builder import PromptTemplateBuilder
-from app.tools.json_tools import parse_json_array
+from app.tools.json_tools import extract_json_array
 from app.observability import traceable
 from app.retry import retry_with_backoff
 from llms import get_llm
 
 logger = logging.getLogger(__name__)
 
+# blake2b(model + question content) -> classification (without question_id).
+# A repeated question (re-upload, retried job, evaluation rerun) reuses the
+# classification it got earlier instead of another LLM call.
+_classification_cache = LRUCache(maxsize=settings.classification_cache_size)
+
+
+def _expected_errors() -> tuple[type[BaseException], ...]:
+    """
+    Exception types for LLM timeouts and dropped connections.
+
+    The provider SDKs raise their own classes, none of which subclass the
+    builtin TimeoutError/ConnectionError, so each installed SDK contributes
+    its types.
+
+    Returns:
+        Tuple of exception types logged without a traceback
+    """
+    errors: list[type[BaseException]] = [TimeoutError, ConnectionError]
+    try:
+        import httpx  # type: ignore[import-not-found]
+        errors += [httpx.TimeoutException, httpx.NetworkError]
+    except ImportError:
+        pass
+    try:
+        import openai  # type: ignore[import-not-found]
+        errors += [openai.APITimeoutError, openai.APIConnectionError]
+    except ImportError:
+        pass
+    try:
+        import groq  # type: ignore[import-not-found]
+        errors += [groq.APITimeoutError, groq.APIConnectionError]
+    except ImportError:
+        pass
+    try:
+        from google.api_core import exceptions as google_exceptions  # type: ignore[import-not-found]
+        errors += [google_exceptions.DeadlineExceeded, google_exceptions.ServiceUnavailable]
+    except ImportError:
+        pass
+    return tuple(errors)
+
+
+# Failures the tools expect (LLM timeouts and dropped connections once
+# retries are exhausted) are logged without a traceback; anything else gets one.
+_EXPECTED_ERRORS = _expected_errors()
+
 
 @tool
 def classify_question(
@@ -61,42 +111,18 @@ def classify_question(
         "geometry"
     """
     try:
-        # Get LLM instance
-        if llm_model:
-            llm = get_llm(llm_model)
-        else:
-            from app.config import settings
-            llm = get_llm(settings.validation_llm_model)
-        
-        # Prepare question data for the prompt
+        # Same prompt and parsing as the batch tool, with a batch of one
         q_id = question_id or "single_question"
-        question_data = [{
-            "question_id": q_id,
-            "question_text": question_text[:1000] if question_text else "",  # Truncate long questions
-            "question_type": question_type,
-            "options": options
-        }]
-        
-        # Build JSON for prompt
-        questions_json = json.dumps(question_data, indent=2)
-        
-        # Build prompt from file
-        prompt = PromptTemplateBuilder.build_from_file(
-            name="classification",
-            variables={"questions_json": questions_json}
+        classifications = _classify(
+            [{
+                "question_id": q_id,
+                "question_text": question_text,
+                "question_type": question_type,
+                "options": options
+            }],
+            llm_model
         )
 
-        # Call LLM with retry
-        @retry_with_backoff(max_retries=2, base_delay=2.0)
-        def _invoke_llm():
-            return llm.invoke(prompt)
-
-        response = _invoke_llm()
-        response_text = response.content if hasattr(response, 'content') else str(response)
-
-        # Parse JSON response using our json tool
-        classifications = parse_json_array.invoke(response_text)
-
         if classifications and len(classifications) > 0:
             classification = classifications[0]
             # Ensure question_id is set
@@ -106,28 +132,30 @@ def classify_question(
         
         # Return default classification if parsing failed
         logger.warning("Classification returned no results, using defaults")
-        return {
-            "question_id": q_id,
-            "topic": "other",
-            "subtopic": "general",
-            "difficulty": "medium",
-            "grade_level": "high_school",
-            "cognitive_level": "comprehension",
-            "tags": []
-        }
+        return _default_classification(q_id)
         
+    except _EXPECTED_ERRORS as e:
+        logger.warning("Error classifying question: %s", e)
+        return _default_classification(question_id or "single_question", e)
     except Exception as e:
-        logger.error(f"Error classifying question: {str(e)}", exc_info=True)
-        return {
-            "question_id": question_id or "single_question",
-            "topic": "other",
-            "subtopic": "general",
-            "difficulty": "medium",
-            "grade_level": "high_school",
-            "cognitive_level": "comprehension",
-            "tags": [],
-            "error": str(e)
-        }
+        logger.error("Error classifying question: %s", e, exc_info=True)
+        return _default_classification(question_id or "single_question", e)
+
+
+def _default_classification(question_id: str, error: Optional[Exception] = None) -> dict[str, Any]:
+    """Fallback classification returned by classify_question when classification fails."""
+    classification = {
+        "question_id": question_id,
+        "topic": "other",
+        "subtopic": "general",
+        "difficulty": "medium",
+        "grade_level": "high_school",
+        "cognitive_level": "comprehension",
+        "tags": []
+    }
+    if error is not None:
+        classification["error"] = str(error)
+    return classification
 
 
 @tool
@@ -135,10 +163,13 @@ def classify_questions_batch(
     questions: list[dict[str, Any]],
     llm_model: Optional[str] = None
 ) -> list[dict[str, Any]]:
-    """Classify multiple questions in a single LLM call for efficiency.
+    """Classify multiple questions with batched LLM calls for efficiency.
     
     More efficient than calling classify_question multiple times when
-    classifying many questions at once.
+    classifying many questions at once. Large inputs are split into chunks
+    of CLASSIFICATION_CHUNK_SIZE questions that are classified concurrently,
+    so latency tracks the slowest chunk rather than one long generation and
+    a single response stays within provider output limits.
     
     Args:
         questions: List of question dictionaries, each containing:
@@ -163,49 +194,138 @@ def classify_questions_batch(
         2
     """
     try:
-        # Get LLM instance
-        if llm_model:
-            llm = get_llm(llm_model)
-        else:
-            from app.config import settings
-            llm = get_llm(settings.validation_llm_model)
-        
         if not questions:
             return []
         
-        # Prepare questions data (truncate long text)
-        questions_data = []
-        for q in questions:
-            q_data = {
-                "question_id": q.get("question_id", "unknown"),
-                "question_text": (q.get("question_text") or "")[:1000],
-                "question_type": q.get("question_type", "open_ended"),
-                "options": q.get("options")
-            }
-            questions_data.append(q_data)
+        size = settings.classification_chunk_size
+        if size <= 0 or len(questions) <= size:
+            classifications = _classify(questions, llm_model)
+            return classifications if classifications else []
         
-        # Build JSON for prompt
-        questions_json = json.dumps(questions_data, indent=2)
+        chunks = [questions[i:i + size] for i in range(0, len(questions), size)]
+        logger.info(f"Classifying {len(chunks)} chunks of up to {size} questions concurrently")
+        workers = max(1, min(settings.classification_max_concurrency, len(chunks)))
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            results = pool.map(lambda chunk: _classify_chunk(chunk, llm_model), chunks)
+            return [c for chunk_result in results for c in chunk_result]
         
-        # Build prompt from file
-        prompt = PromptTemplateBuilder.build_from_file(
-            name="classification",
-            variables={"questions_json": questions_json}
-        )
-
-        # Call LLM with retry
-        @retry_with_backoff(max_retries=2, base_delay=2.0)
-        def _invoke_batch_llm():
-            return llm.invoke(prompt)
-
-        response = _invoke_batch_llm()
-        response_text = response.content if hasattr(response, 'content') else str(response)
+    except _EXPECTED_ERRORS as e:
+        logger.warning("Error in batch classification: %s", e)
+        return []
+    except Exception as e:
+        logger.error("Error in batch classification: %s", e, exc_info=True)
+        return []
 
-        # Parse JSON response
-        classifications = parse_json_array.invoke(response_text)
 
-        return classifications if classifications else []
-        
+def _classify_chunk(questions: list[dict[str, Any]], llm_model: Optional[str]) -> list[dict[str, Any]]:
+    """Classify one chunk; a failed chunk yields no results without affecting the others."""
+    try:
+        return _classify(questions, llm_model) or []
+    except _EXPECTED_ERRORS as e:
+        logger.warning("Error classifying chunk of %d questions: %s", len(questions), e)
+        return []
     except Exception as e:
-        logger.error(f"Error in batch classification: {str(e)}", exc_info=True)
+        logger.error("Error classifying chunk of %d questions: %s", len(questions), e, exc_info=True)
         return []
+
+
+def _classify(questions: list[dict[str, Any]], llm_model: Optional[str]) -> list[dict[str, Any]]:
+    """Classify questions with one LLM call using the classification prompt.
+
+    Shared by classify_question and classify_questions_batch; errors from
+    the LLM call propagate to the calling tool. Questions already classified
+    in this process (same model and content) are served from a cache and
+    left out of the prompt.
+
+    Args:
+        questions: Question dictionaries (question_id, question_text, question_type, options)
+        llm_model: Optional LLM model name (defaults to config setting)
+
+    Returns:
+        Classification dictionaries in the order of ``questions``, followed by
+        any parsed classifications that match no question (empty if none)
+    """
+    model = llm_model or settings.validation_llm_model
+    
+    # Prepare questions data (truncate long text), serving cached ones directly.
+    # slots keeps (question_id, cached result or None) in input order.
+    slots = []
+    questions_data = []
+    miss_keys = {}
+    for q in questions:
+        q_data = {
+            "question_id": q.get("question_id", "unknown"),
+            "question_text": (q.get("question_text") or "")[:1000],
+            "question_type": q.get("question_type", "open_ended"),
+            "options": q.get("options")
+        }
+        key = _cache_key(model, q_data)
+        cached = _classification_cache.get(key)
+        if cached is not None:
+            result = {**copy.deepcopy(cached), "question_id": q_data["question_id"]}
+            slots.append((q_data["question_id"], result))
+        else:
+            slots.append((q_data["question_id"], None))
+            questions_data.append(q_data)
+            miss_keys[q_data["question_id"]] = key
+    
+    if len(questions_data) < len(questions):
+        logger.debug(f"Classification cache hits: {len(questions) - len(questions_data)} of {len(questions)}")
+    if not questions_data:
+        return [result for _, result in slots]
+    
+    # Get LLM instance
+    llm = get_llm(model)
+    
+    # Build JSON for prompt (compact: indentation only costs prompt tokens)
+    questions_json = json.dumps(questions_data, separators=(",", ":"))
+    
+    # Build prompt from file
+    prompt = PromptTemplateBuilder.build_from_file(
+        name="classification",
+        variables={"questions_json": questions_json}
+    )
+
+    # Call LLM with retry
+    @retry_with_backoff(max_retries=2, base_delay=2.0)
+    def _invoke_llm():
+        return llm.invoke(prompt)
+
+    response = _invoke_llm()
+    # Chat models always return a message
+    response_text = response.content
+
+    # Parse JSON response (plain function: no tool-call overhead per response)
+    classifications = extract_json_array(response_text)
+
+    fresh = {}
+    unmatched = []
+    for classification in classifications:
+        q_id = classification.get("question_id") if isinstance(classification, dict) else None
+        key = miss_keys.get(q_id) if isinstance(q_id, str) else None
+        if key is None:
+            unmatched.append(classification)
+            continue
+        _classification_cache.set(key, copy.deepcopy(classification))
+        fresh.setdefault(q_id, []).append(classification)
+
+    # Rebuild in input order; results the LLM returned without a matching
+    # question_id (or as extra duplicates) are kept at the end
+    ordered = []
+    for q_id, result in slots:
+        if result is None and fresh.get(q_id):
+            result = fresh[q_id].pop(0)
+        if result is not None:
+            ordered.append(result)
+    ordered.extend(c for remaining in fresh.values() for c in remaining)
+    ordered.extend(unmatched)
+    return ordered
+
+
+def _cache_key(model: str, q_data: dict[str, Any]) -> bytes:
+    """Content hash of what the LLM sees for a question (its ID excluded)."""
+    content = json.dumps(
+        [model, q_data["question_text"], q_data["question_type"], q_data["options"]],
+        sort_keys=True
+    )
+    return hashlib.blake2b(content.encode("utf-8"), digest_size=16).digest()
@@ -6,12 +6,27 @@ common formatting issues like markdown code blocks.
 
 import json
 import logging
+import re
 from typing import Any
 
 from langchain_core.tools import tool
 
+try:
+    from orjson import loads as _json_loads  # C parser, installed with langsmith
+except ImportError:
+    from json import loads as _json_loads
+
 logger = logging.getLogger(__name__)
 
+# A response wrapped entirely in a ```json (or bare ```) code block
+_FENCE_RE = re.compile(r"\A\s*```(?:json)?\s*(.*?)\s*```\s*\Z", re.DOTALL)
+
+
+def _strip_code_fence(response_text: str) -> str:
+    """Return the contents of a fenced response, or the stripped text otherwise."""
+    match = _FENCE_RE.match(response_text)
+    return match.group(1) if match else response_text.strip()
+
 
 @tool
 def parse_json_array(response_text: str) -> list[dict[str, Any]]:
@@ -33,20 +48,26 @@ def parse_json_array(response_text: str) -> list[dict[str, Any]]:
         >>> print(result)
         [{"id": 1}]
     """
+    return extract_json_array(response_text)
+
+
+def extract_json_array(response_text: str) -> list[dict[str, Any]]:
+    """Plain-function form of the parse_json_array tool.
+
+    Internal callers use this directly to skip the tool wrapper's input
+    validation and callback setup on every call.
+    """
     try:
-        # Clean up response
-        text = response_text.strip()
+        text = _strip_code_fence(response_text)
         
-        # Remove markdown code block wrappers
-        if text.startswith("```json"):
-            text = text[7:]
-        elif text.startswith("```"):
-            text = text[3:]
-        
-        if text.endswith("```"):
-            text = text[:-3]
-        
-        text = text.strip()
+        # Most responses are bare JSON once unfenced: parse directly and only
+        # search for the array boundaries when that fails
+        try:
+            parsed = _json_loads(text)
+        except json.JSONDecodeError:
+            parsed = None
+        if isinstance(parsed, list):
+            return parsed
         
         # Find JSON array boundaries
         start = text.find('[')
@@ -54,22 +75,22 @@ def parse_json_array(response_text: str) -> list[dict[str, Any]]:
         
         if start >= 0 and end > start:
             json_str = text[start:end]
-            parsed = json.loads(json_str)
+            parsed = _json_loads(json_str)
             
             if isinstance(parsed, list):
                 return parsed
             else:
-                logger.warning(f"Parsed JSON is not an array: {type(parsed)}")
+                logger.warning("Parsed JSON is not an array: %s", type(parsed))
                 return []
         
-        logger.warning(f"Could not find JSON array in text: {text[:200]}...")
+        logger.warning("Could not find JSON array in text: %s...", text[:200])
         return []
         
     except json.JSONDecodeError as e:
-        logger.error(f"JSON decode error: {str(e)}")
+        logger.error("JSON decode error: %s", e)
         return []
     except Exception as e:
-        logger.error(f"Error parsing JSON array: {str(e)}")
+        logger.error("Error parsing JSON array: %s", e)
         return []
 
 
@@ -93,20 +114,26 @@ def parse_json_object(response_text: str) -> dict[str, Any]:
         >>> print(result)
         {"name": "test"}
     """
+    return extract_json_object(response_text)
+
+
+def extract_json_object(response_text: str) -> dict[str, Any]:
+    """Plain-function form of the parse_json_object tool.
+
+    Internal callers use this directly to skip the tool wrapper's input
+    validation and callback setup on every call.
+    """
     try:
-        # Clean up response
-        text = response_text.strip()
-        
-        # Remove markdown code block wrappers
-        if text.startswith("```json"):
-            text = text[7:]
-        elif text.startswith("```"):
-            text = text[3:]
-        
-        if text.endswith("```"):
-            text = text[:-3]
+        text = _strip_code_fence(response_text)
         
-        text = text.strip()
+        # Most responses are bare JSON once unfenced: parse directly and only
+        # search for the object boundaries when that fails
+        try:
+            parsed = _json_loads(text)
+        except json.JSONDecodeError:
+            parsed = None
+        if isinstance(parsed, dict):
+            return parsed
         
         # Find JSON object boundaries
         start = text.find('{')
@@ -114,20 +141,20 @@ def parse_json_object(response_text: str) -> dict[str, Any]:
         
         if start >= 0 and end > start:
             json_str = text[start:end]
-            parsed = json.loads(json_str)
+            parsed = _json_loads(json_str)
             
             if isinstance(parsed, dict):
                 return parsed
             else:
-                logger.warning(f"Parsed JSON is not an object: {type(parsed)}")
+                logger.warning("Parsed JSON is not an object: %s", type(parsed))
                 return {}
         
-        logger.warning(f"Could not find JSON object in text: {text[:200]}...")
+        logger.warning("Could not find JSON object in text: %s...", text[:200])
         return {}
         
     except json.JSONDecodeError as e:
-        logger.error(f"JSON decode error: {str(e)}")
+        logger.error("JSON decode error: %s", e)
         return {}
     except Exception as e:
-        logger.error(f"Error parsing JSON object: {str(e)}")
+        logger.error("Error parsing JSON object: %s", e)
         return {}
@@ -13,6 +13,10 @@ from app.services.search_service import SearchService
 
 logger = logging.getLogger(__name__)
 
+# Failures the tools expect (bad input, network timeouts and dropped
+# connections) are logged without a traceback; anything else gets one.
+_EXPECTED_ERRORS = (ValueError, TimeoutError, ConnectionError)
+
 # Singleton service instance for reuse
 _search_service: Optional[SearchService] = None
 
@@ -68,11 +72,61 @@ def search_similar_questions(
             limit=limit,
             min_similarity=min_similarity
         )
+    except _EXPECTED_ERRORS as e:
+        logger.warning("Error in search_similar_questions tool: %s", e)
+        return []
     except Exception as e:
-        logger.error(f"Error in search_similar_questions tool: {str(e)}", exc_info=True)
+        logger.error("Error in search_similar_questions tool: %s", e, exc_info=True)
         return []
 
 
+@tool
+def search_similar_questions_batch(
+    queries: list[str],
+    user_id: str,
+    limit: int = 10,
+    min_similarity: float = 0.3
+) -> list[list[dict[str, Any]]]:
+    """Run several similarity searches for one user in a single call.
+    
+    All queries are embedded together in one model call and their
+    database lookups run concurrently, so this is much cheaper than
+    calling search_similar_questions once per query.
+    
+    Args:
+        queries: Natural language search queries
+        user_id: User ID to scope the search (required for data isolation)
+        limit: Maximum number of results per query (default: 10, max: 50)
+        min_similarity: Minimum similarity threshold 0-1 (default: 0.3)
+        
+    Returns:
+        One list of results per query, in the same order as ``queries``.
+        Each result has the same shape as search_similar_questions results.
+        
+    Example:
+        >>> results = search_similar_questions_batch.invoke({
+        ...     "queries": ["triangle area", "photosynthesis"],
+        ...     "user_id": "user123"
+        ... })
+        >>> print(len(results))
+        2
+    """
+    try:
+        service = _get_search_service()
+        return service.search_questions_batch(
+            queries=queries,
+            user_id=user_id,
+            limit=limit,
+            min_similarity=min_similarity
+        )
+    except _EXPECTED_ERRORS as e:
+        logger.warning("Error in search_similar_questions_batch tool: %s", e)
+        return [[] for _ in queries]
+    except Exception as e:
+        logger.error("Error in search_similar_questions_batch tool: %s", e, exc_info=True)
+        return [[] for _ in queries]
+
+
 @tool
 def find_related_questions(
     question_id: str,
@@ -109,8 +163,11 @@ def find_related_questions(
             limit=limit,
             exclude_self=True
         )
+    except _EXPECTED_ERRORS as e:
+        logger.warning("Error in find_related_questions tool: %s", e)
+        return []
     except Exception as e:
-        logger.error(f"Error in find_related_questions tool: {str(e)}", exc_info=True)
+        logger.error("Error in find_related_questions tool: %s", e, exc_info=True)
         return []
 
 
@@ -138,12 +195,20 @@ def get_search_statistics(user_id: str) -> dict[str, Any]:
     try:
         service = _get_search_service()
         return service.get_search_stats(user_id=user_id)
+    except _EXPECTED_ERRORS as e:
+        logger.warning("Error in get_search_statistics tool: %s", e)
+        return _empty_search_stats(user_id, e)
     except Exception as e:
-        logger.error(f"Error in get_search_statistics tool: {str(e)}", exc_info=True)
-        return {
-            "user_id": user_id,
-            "total_questions": 0,
-            "embedded_questions": 0,
-            "searchable_percentage": 0,
-            "error": str(e)
-        }
+        logger.error("Error in get_search_statistics tool: %s", e, exc_info=True)
+        return _empty_search_stats(user_id, e)
+
+
+def _empty_search_stats(user_id: str, error: Exception) -> dict[str, Any]:
+    """Stats payload returned by get_search_statistics when the lookup fails."""
+    return {
+        "user_id": user_id,
+        "total_questions": 0,
+        "embedded_questions": 0,
+        "searchable_percentage": 0,
+        "error": str(error)
+    }
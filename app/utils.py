@@ -2,6 +2,8 @@
 
 import bcrypt
 
+from app.config import settings
+
 
 def hash_client_secret(plain_secret: str) -> str:
     """
@@ -19,8 +21,9 @@ def hash_client_secret(plain_secret: str) -> str:
     if len(secret_bytes) > 72:
         secret_bytes = secret_bytes[:72]
     
-    # Generate salt and hash
-    salt = bcrypt.gensalt()
+    # Generate salt and hash. The cost is stored in the hash itself, so
+    # verification works for secrets hashed with any rounds setting.
+    salt = bcrypt.gensalt(rounds=settings.client_secret_bcrypt_rounds)
     hashed = bcrypt.hashpw(secret_bytes, salt)
     return hashed.decode('utf-8')
 
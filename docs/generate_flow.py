@@ -1,5 +1,8 @@
 """Generate end-to-end flow diagram for DocumentLynx."""
 
+import hashlib
+import os
+
 import graphviz
 
 dot = graphviz.Digraph(
@@ -172,5 +175,22 @@ dot.edge("ingestion", "langsmith", style="dotted", color="#EC489966", arrowhead=
 dot.edge("vectorization", "langsmith", style="dotted", color="#EC489966", arrowhead="none")
 
 # ── Render ──
-output_path = dot.render("/Users/sajad/documentlynx/docs/documentlynx-flow", cleanup=True)
-print(f"Generated: {output_path}")
+# Running `dot` takes a noticeable moment; skip it when the diagram source is
+# unchanged since the last render (hash kept in a sidecar file).
+output_base = "/Users/sajad/documentlynx/docs/documentlynx-flow"
+output_path = f"{output_base}.{dot.format}"
+hash_path = f"{output_base}.hash"
+digest = hashlib.blake2b(dot.source.encode(), digest_size=8).hexdigest()
+
+cached_digest = None
+if os.path.exists(output_path) and os.path.exists(hash_path):
+    with open(hash_path) as f:
+        cached_digest = f.read().strip()
+
+if cached_digest == digest:
+    print(f"Up to date: {output_path}")
+else:
+    output_path = dot.render(output_base, cleanup=True)
+    with open(hash_path, "w") as f:
+        f.write(digest)
+    print(f"Generated: {output_path}")
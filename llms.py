@@ -1,66 +1,85 @@
 import os
-from langchain_openai import ChatOpenAI
-from langchain_google_genai import ChatGoogleGenerativeAI
-from langchain_groq import ChatGroq
+from functools import lru_cache
 
-from dotenv import load_dotenv
+# Provider SDKs (langchain_openai, langchain_google_genai, langchain_groq) are
+# imported inside the model factories below: each pulls in its own
+# HTTP/protobuf stack, and a process only needs the ones for its models.
 
-load_dotenv()
+# Deployments that set the environment externally can skip reading .env
+if os.getenv("DOCLYNX_SKIP_DOTENV") != "1":
+    from dotenv import load_dotenv
+
+    load_dotenv()
 
 # Default timeout for LLM calls (seconds)
 LLM_REQUEST_TIMEOUT = 60
 
-available_models = [
-    "gpt-4o",
-    "gpt-4o-mini",
-    "gemini-1.5-flash",
-    "gemini-1.5-pro",
-    "llama-3.1-8b-instant",
-    "llama-3.3-70b-versatile",
-    "qwen/qwen3-32b",
-    "openai/gpt-oss-20b",
-    "lm-studio",
-]
+def _openai(model: str):
+    from langchain_openai import ChatOpenAI
+
+    return ChatOpenAI(
+        model_name=model,
+        temperature=0.0,
+        api_key=os.getenv("OPENAI_API_KEY"),
+        request_timeout=LLM_REQUEST_TIMEOUT,
+    )
+
+
+def _gemini(model: str):
+    from langchain_google_genai import ChatGoogleGenerativeAI
+
+    return ChatGoogleGenerativeAI(
+        model=model,
+        temperature=0.0,
+        api_key=os.getenv("GOOGLE_API_KEY"),
+        timeout=LLM_REQUEST_TIMEOUT,
+    )
+
+
+def _lm_studio(model: str):
+    from langchain_openai import ChatOpenAI
+
+    return ChatOpenAI(
+        base_url="http://localhost:1234/v1",
+        api_key="lm-studio",
+        model="openai/gpt-oss-20b",
+        temperature=0.7,
+        request_timeout=LLM_REQUEST_TIMEOUT,
+    )
 
 
+def _groq(model: str):
+    from langchain_groq import ChatGroq
+
+    return ChatGroq(
+        model_name=model,
+        temperature=0.0,
+        api_key=os.getenv("GROQ_API_KEY"),
+        request_timeout=LLM_REQUEST_TIMEOUT,
+    )
+
+
+# Model name -> factory that builds its chat model
+_MODEL_FACTORIES = {
+    "gpt-4o": _openai,
+    "gpt-4o-mini": _openai,
+    "gemini-1.5-flash": _gemini,
+    "gemini-1.5-pro": _gemini,
+    "llama-3.1-8b-instant": _groq,
+    "llama-3.3-70b-versatile": _groq,
+    "qwen/qwen3-32b": _groq,
+    "openai/gpt-oss-20b": _groq,
+    "lm-studio": _lm_studio,
+}
+
+available_models = list(_MODEL_FACTORIES)
+
+
+# Chat models are safe to share across threads; one instance per model keeps
+# its HTTP client (and connection pool) alive between calls
+@lru_cache(maxsize=16)
 def get_llm(model: str):
-    if model not in available_models:
+    factory = _MODEL_FACTORIES.get(model)
+    if factory is None:
         raise ValueError(f"Invalid model '{model}'. Available models: {available_models}")
-
-    if model in ["gpt-4o", "gpt-4o-mini"]:
-        return ChatOpenAI(
-            model_name=model,
-            temperature=0.0,
-            api_key=os.getenv("OPENAI_API_KEY"),
-            request_timeout=LLM_REQUEST_TIMEOUT,
-        )
-    elif model in ["gemini-1.5-flash", "gemini-1.5-pro"]:
-        return ChatGoogleGenerativeAI(
-            model=model,
-            temperature=0.0,
-            api_key=os.getenv("GOOGLE_API_KEY"),
-            timeout=LLM_REQUEST_TIMEOUT,
-        )
-    elif model == "lm-studio":
-        return ChatOpenAI(
-            base_url="http://localhost:1234/v1",
-            api_key="lm-studio",
-            model="openai/gpt-oss-20b",
-            temperature=0.7,
-            request_timeout=LLM_REQUEST_TIMEOUT,
-        )
-    elif model in [
-        "llama-3.1-8b-instant",
-        "llama-3.3-70b-versatile",
-        "qwen/qwen3-32b",
-        "openai/gpt-oss-20b",
-    ]:
-        return ChatGroq(
-            model_name=model,
-            temperature=0.0,
-            api_key=os.getenv("GROQ_API_KEY"),
-            request_timeout=LLM_REQUEST_TIMEOUT,
-        )
-
-    # Fallback - should not reach here due to validation above
-    raise ValueError(f"Model '{model}' not configured")
+    return factory(model)
@@ -20,7 +20,27 @@ import json
 import logging
 import sys
 
-from app.evaluation.harness import EvaluationHarness
+try:
+    import orjson  # C serializer, installed with langsmith
+except ImportError:
+    orjson = None
+
+
+def _write_results(results: dict, path: str) -> None:
+    """Write the evaluation results to ``path`` as indented JSON."""
+    if orjson is not None:
+        # default=str matches the json fallback, so a stray non-JSON value
+        # can't fail only under one backend after a full eval run
+        with open(path, "wb") as f:
+            f.write(orjson.dumps(
+                results,
+                default=str,
+                option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS,
+            ))
+        return
+
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(results, f, indent=2, default=str)
 
 
 def main():
@@ -71,13 +91,15 @@ def main():
         datefmt="%H:%M:%S",
     )
 
+    # Imported here so --help and argument errors don't load the app stack
+    from app.evaluation.harness import EvaluationHarness
+
     # Run evaluations
     harness = EvaluationHarness(dataset_path=args.dataset)
     results = harness.run(mode=args.mode, agent=args.agent)
 
     # Write results
-    with open(args.output, "w", encoding="utf-8") as f:
-        json.dump(results, f, indent=2, default=str)
+    _write_results(results, args.output)
 
     # Print summary
     passed = results.get("passed", 0)
@@ -86,44 +108,49 @@ def main():
     pass_rate = results.get("pass_rate", 0.0)
     duration = results.get("duration_ms", 0.0)
 
-    print()
-    print("=" * 60)
-    print("  DOCULORD EVALUATION RESULTS")
-    print("=" * 60)
-    print(f"  Mode:     {args.mode}")
-    print(f"  Agent:    {args.agent}")
-    print(f"  Dataset:  {args.dataset or 'baseline_questions.json'}")
-    print("-" * 60)
-    print(f"  Passed:   {passed}/{total} ({pass_rate:.0%})")
-    print(f"  Failed:   {failed}")
-    print(f"  Duration: {duration:.0f}ms")
-    print("-" * 60)
-
-    # Print score distribution
+    lines = [
+        "",
+        "=" * 60,
+        "  DOCULORD EVALUATION RESULTS",
+        "=" * 60,
+        f"  Mode:     {args.mode}",
+        f"  Agent:    {args.agent}",
+        f"  Dataset:  {args.dataset or 'baseline_questions.json'}",
+        "-" * 60,
+        f"  Passed:   {passed}/{total} ({pass_rate:.0%})",
+        f"  Failed:   {failed}",
+        f"  Duration: {duration:.0f}ms",
+        "-" * 60,
+    ]
+
+    # Score distribution
     score_dist = results.get("score_distribution", {})
     if score_dist:
-        print("  Score distribution:")
+        lines.append("  Score distribution:")
         for metric, stats in score_dist.items():
-            print(
+            lines.append(
                 f"    {metric:30s}  "
                 f"min={stats['min']:.2f}  "
                 f"max={stats['max']:.2f}  "
                 f"mean={stats['mean']:.2f}"
             )
-        print("-" * 60)
+        lines.append("-" * 60)
 
-    # Print per-test details for failures
+    # Per-test details for failures
     failing = [r for r in results.get("results", []) if not r.get("passed")]
     if failing:
-        print("  Failed test cases:")
+        lines.append("  Failed test cases:")
         for r in failing:
             error_info = f" -- {r['error']}" if r.get("error") else ""
-            print(f"    [{r['agent']}] {r['test_id']}: scores={r.get('scores', {})}{error_info}")
-        print("-" * 60)
+            lines.append(f"    [{r['agent']}] {r['test_id']}: scores={r.get('scores', {})}{error_info}")
+        lines.append("-" * 60)
+
+    lines.append(f"  Results written to: {args.output}")
+    lines.append("=" * 60)
+    lines.append("")
 
-    print(f"  Results written to: {args.output}")
-    print("=" * 60)
-    print()
+    # Print the summary in one write
+    sys.stdout.write("\n".join(lines) + "\n")
 
     sys.exit(0 if passed == total else 1)
 
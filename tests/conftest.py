@@ -3,36 +3,62 @@
 All fixtures mock external dependencies (database, GCS, LLM) so that tests
 can run without a live database or cloud services.
 
-The ``_bootstrap_app_config`` autouse session fixture ensures that
-``app.config.Settings`` can be instantiated and ``app.database`` can be
-imported even when no ``.env`` file or real Google credentials are present.
+The ``_bootstrap_app_config`` step, run from ``pytest_configure`` before
+collection, ensures that ``app.config.Settings`` can be instantiated and
+``app.database`` can be imported even when no ``.env`` file or real Google
+credentials are present.
 """
 
-import json
 import os
 import sys
+import tempfile
+from contextlib import ExitStack
+from pathlib import Path
+from types import MappingProxyType, SimpleNamespace
+
 import pytest
-from unittest.mock import MagicMock, patch
+import pytest_asyncio
+from unittest.mock import MagicMock, Mock, patch
 
 
 # ---------------------------------------------------------------------------
-# Session-scoped: set up env vars, fake credentials, and mock the DB engine
-# BEFORE any ``app.*`` module is imported.
+# Session bootstrap: set up env vars, fake credentials, and mock the DB engine
+# BEFORE any ``app.*`` module is imported.  This runs from
+# ``pytest_configure`` (before collection) so test modules can import
+# ``app.*`` at module level.
 # ---------------------------------------------------------------------------
 
-@pytest.fixture(autouse=True, scope="session")
-def _bootstrap_app_config(tmp_path_factory):
+# Contents of the fake Google credentials file
+_FAKE_CREDENTIALS_JSON = '{"type": "service_account", "project_id": "test"}'
+
+# Undoes the bootstrap (env vars, patches, temp dirs) in pytest_unconfigure
+_bootstrap = ExitStack()
+
+
+def pytest_configure(config):
+    """Bootstrap the app configuration before test modules are collected."""
+    _bootstrap_app_config(_bootstrap)
+
+
+def pytest_unconfigure(config):
+    """Restore the environment and stop the bootstrap patches."""
+    _bootstrap.close()
+
+
+def _bootstrap_app_config(stack):
     """Create a fake credential file, set dummy env vars, and patch the
     SQLAlchemy engine/sessionmaker so all ``app.*`` imports succeed without
     external services.
+
+    Everything is registered on ``stack`` so closing it undoes the bootstrap.
     """
     # -- 1. Fake Google credentials file -----------------------------------
-    creds_dir = tmp_path_factory.mktemp("creds")
+    creds_dir = Path(stack.enter_context(tempfile.TemporaryDirectory(prefix="creds")))
     creds_file = creds_dir / "fake-credentials.json"
-    creds_file.write_text(json.dumps({"type": "service_account", "project_id": "test"}))
+    creds_file.write_text(_FAKE_CREDENTIALS_JSON)
 
     # -- 2. Temp dir for Docling -------------------------------------------
-    temp_dir = tmp_path_factory.mktemp("docling_temp")
+    temp_dir = stack.enter_context(tempfile.TemporaryDirectory(prefix="docling_temp"))
 
     # -- 3. Env vars -------------------------------------------------------
     env_overrides = {
@@ -45,16 +71,11 @@ def _bootstrap_app_config(tmp_path_factory):
         "DOCLING_TIMEOUT_SECONDS": "30",
         "DOCLING_TEMP_DIR": str(temp_dir),
     }
-
-    saved = {}
-    for key, value in env_overrides.items():
-        saved[key] = os.environ.get(key)
-        os.environ[key] = value
+    stack.enter_context(patch.dict(os.environ, env_overrides))
 
     # -- 4. Evict cached app modules so they re-import with new env --------
-    for mod_name in list(sys.modules.keys()):
-        if mod_name.startswith("app."):
-            del sys.modules[mod_name]
+    for mod_name in [m for m in sys.modules if m.startswith("app.")]:
+        sys.modules.pop(mod_name, None)
 
     # -- 5. Patch the real sqlalchemy functions BEFORE app.database imports -
     #    ``app.database`` calls ``create_engine(...)`` at module level, so
@@ -63,16 +84,8 @@ def _bootstrap_app_config(tmp_path_factory):
     mock_engine = MagicMock()
     mock_session_factory = MagicMock()
 
-    with patch("sqlalchemy.create_engine", return_value=mock_engine), \
-         patch("sqlalchemy.orm.sessionmaker", return_value=mock_session_factory):
-        yield
-
-    # -- 6. Restore env vars -----------------------------------------------
-    for key, orig in saved.items():
-        if orig is None:
-            os.environ.pop(key, None)
-        else:
-            os.environ[key] = orig
+    stack.enter_context(patch("sqlalchemy.create_engine", return_value=mock_engine))
+    stack.enter_context(patch("sqlalchemy.orm.sessionmaker", return_value=mock_session_factory))
 
 
 # ---------------------------------------------------------------------------
@@ -83,16 +96,20 @@ def mock_db():
     """Return a MagicMock that behaves like a SQLAlchemy Session.
 
     Common methods (add, commit, flush, refresh, close, rollback, query,
-    execute) are available as regular MagicMocks so callers can assert on
-    them or configure return values.
+    execute) are available as child mocks so callers can assert on them or
+    configure return values.
     """
+    # A Session is used as a context manager, and query()/execute() results
+    # are iterated, so those keep MagicMock's magic methods. The write and
+    # lifecycle methods are only called and asserted on, so a plain Mock is
+    # enough for them.
     session = MagicMock()
-    session.add = MagicMock()
-    session.commit = MagicMock()
-    session.flush = MagicMock()
-    session.refresh = MagicMock()
-    session.close = MagicMock()
-    session.rollback = MagicMock()
+    session.add = Mock()
+    session.commit = Mock()
+    session.flush = Mock()
+    session.refresh = Mock()
+    session.close = Mock()
+    session.rollback = Mock()
     session.query = MagicMock()
     session.execute = MagicMock()
     return session
@@ -103,15 +120,15 @@ def mock_db():
 # ---------------------------------------------------------------------------
 @pytest.fixture
 def mock_llm():
-    """Return a MagicMock LLM whose ``invoke()`` response is configurable.
+    """Return a mock LLM whose ``invoke()`` response is configurable.
 
     By default ``invoke()`` returns an object with ``.content`` set to
     ``"mock llm response"``.  Override via::
 
         mock_llm.invoke.return_value.content = "custom response"
     """
-    llm = MagicMock()
-    response = MagicMock()
+    llm = Mock()
+    response = Mock()
     response.content = "mock llm response"
     llm.invoke.return_value = response
     return llm
@@ -122,7 +139,7 @@ def mock_llm():
 # ---------------------------------------------------------------------------
 @pytest.fixture
 def mock_gcs():
-    """Return a MagicMock that stands in for ``app.services.storage_service.StorageService``.
+    """Return a mock that stands in for ``app.services.storage_service.StorageService``.
 
     Pre-configured methods:
     - ``upload_document`` returns a fake signed URL.
@@ -130,67 +147,129 @@ def mock_gcs():
     - ``upload_images_from_zip`` returns an empty mapping.
     - ``bucket.exists()`` returns True.
     """
-    svc = MagicMock()
+    svc = Mock()
     svc.upload_document.return_value = "https://storage.example.com/fake-signed-url"
     svc.upload_image_public.return_value = "https://example.com/images/fake.png"
     svc.upload_images_from_zip.return_value = {}
-    svc.bucket = MagicMock()
+    svc.bucket = Mock()
     svc.bucket.exists.return_value = True
     return svc
 
 
 # ---------------------------------------------------------------------------
-# sample_agent_state -- a valid AgentState dict
+# mocks -- mock_db, mock_llm and mock_gcs in one fixture
 # ---------------------------------------------------------------------------
 @pytest.fixture
+def mocks(mock_db, mock_llm, mock_gcs):
+    """Return the database, LLM and storage mocks as one namespace.
+
+    For tests that need all three: ``mocks.db``, ``mocks.llm`` and
+    ``mocks.gcs`` are the same objects as the individual fixtures.
+    """
+    return SimpleNamespace(db=mock_db, llm=mock_llm, gcs=mock_gcs)
+
+
+# ---------------------------------------------------------------------------
+# sample_agent_state / make_sample_state -- valid AgentState dicts
+# ---------------------------------------------------------------------------
+_SAMPLE_AGENT_STATE = MappingProxyType({
+    "job_id": "test-job-123",
+    "user_id": "test-user-456",
+    "document_url": "https://storage.example.com/documents/test.pdf",
+    "document_filename": "test.pdf",
+    "file_type": "pdf",
+    "raw_content": None,
+    "parsed_markdown": None,
+    "cleaned_markdown": None,
+    "extracted_questions": None,
+    "validated_markdown": None,
+    "vector_ids": None,
+    "status": "pending",
+    "error_message": None,
+    "metadata": {},
+    "validation_attempts": 0,
+    "validation_passed": False,
+    "docling_options": None,
+    "use_file_conversion": False,
+    "output_zip_path": None,
+    "source_file_path": None,
+    "validation_feedback": None,
+    "document_id": None,
+    "question_ids": None,
+    "public_markdown": None,
+})
+
+
+@pytest.fixture(scope="session")
 def sample_agent_state():
-    """Return a valid ``AgentState`` dictionary with all required fields populated."""
-    return {
-        "job_id": "test-job-123",
-        "user_id": "test-user-456",
-        "document_url": "https://storage.example.com/documents/test.pdf",
-        "document_filename": "test.pdf",
-        "file_type": "pdf",
-        "raw_content": None,
-        "parsed_markdown": None,
-        "cleaned_markdown": None,
-        "extracted_questions": None,
-        "validated_markdown": None,
-        "vector_ids": None,
-        "status": "pending",
-        "error_message": None,
-        "metadata": {},
-        "validation_attempts": 0,
-        "validation_passed": False,
-        "docling_options": None,
-        "use_file_conversion": False,
-        "output_zip_path": None,
-        "source_file_path": None,
-        "validation_feedback": None,
-        "document_id": None,
-        "question_ids": None,
-        "public_markdown": None,
-    }
+    """Return a valid ``AgentState`` mapping with all required fields populated.
+
+    The mapping is shared by every test and read-only; use
+    ``make_sample_state`` to get a mutable copy.
+    """
+    return _SAMPLE_AGENT_STATE
+
+
+def _make_sample_state(**overrides):
+    """Return a fresh ``AgentState`` dict with ``overrides`` applied.
+
+    ``metadata`` gets a new dict each time so tests never share it.
+    """
+    return {**_SAMPLE_AGENT_STATE, "metadata": {}, **overrides}
+
+
+@pytest.fixture(scope="session")
+def make_sample_state():
+    """Return a factory for mutable ``AgentState`` dicts, e.g.
+    ``make_sample_state(cleaned_markdown="# Doc")``.
+    """
+    return _make_sample_state
+
+
+# ---------------------------------------------------------------------------
+# patched_main_app -- the FastAPI app, imported and patched once per session
+# ---------------------------------------------------------------------------
+@pytest.fixture(scope="session")
+def patched_main_app():
+    """Yield ``app.main.app`` with its database objects patched out.
+
+    ``app.main`` is imported once and
+    ``Base``, ``engine`` and ``SessionLocal`` stay patched for the whole
+    session instead of being patched again by every test. Tests that need
+    a specific session can still patch ``app.main.SessionLocal`` locally.
+    """
+    from app.main import app
+
+    with ExitStack() as stack:
+        stack.enter_context(patch("app.main.Base"))
+        stack.enter_context(patch("app.main.engine"))
+        stack.enter_context(patch("app.main.SessionLocal"))
+        yield app
+
+
+# ---------------------------------------------------------------------------
+# _asgi_transport -- one ASGI transport for the patched app per session
+# ---------------------------------------------------------------------------
+@pytest.fixture(scope="session")
+def _asgi_transport(patched_main_app):
+    """Return an ``httpx.ASGITransport`` for the FastAPI app, shared by all clients."""
+    import httpx
+
+    return httpx.ASGITransport(app=patched_main_app)
 
 
 # ---------------------------------------------------------------------------
 # app_client -- httpx AsyncClient wired to the FastAPI app
 # ---------------------------------------------------------------------------
-@pytest.fixture
-async def app_client():
+@pytest_asyncio.fixture
+async def app_client(_asgi_transport):
     """Yield an ``httpx.AsyncClient`` connected to the FastAPI application.
 
     All heavy startup side-effects (database init, LangSmith config) are
-    patched out so the test runs without external services.
+    patched out so the test runs without external services. Each test gets
+    its own client over the session's shared transport.
     """
     import httpx
 
-    with patch("app.main.Base") as mock_base, \
-         patch("app.main.engine"), \
-         patch("app.main.SessionLocal") as mock_sl:
-
-        from app.main import app
-
-        transport = httpx.ASGITransport(app=app)
-        async with httpx.AsyncClient(transport=transport, base_url="http://testserver") as client:
-            yield client
+    async with httpx.AsyncClient(transport=_asgi_transport, base_url="http://testserver") as client:
+        yield client
@@ -0,0 +1,65 @@
+"""Unit tests for app.cache.LRUCache."""
+
+from app.cache import LRUCache
+
+
+class TestLRUCache:
+    """Tests for the LRUCache class."""
+
+    def test_get_returns_default_on_miss(self):
+        """A missing key should return the supplied default."""
+        cache = LRUCache(maxsize=2)
+
+        assert cache.get("missing") is None
+        assert cache.get("missing", "fallback") == "fallback"
+
+    def test_evicts_least_recently_used(self):
+        """Inserting past maxsize should evict the least recently used entry."""
+        cache = LRUCache(maxsize=2)
+        cache.set("a", 1)
+        cache.set("b", 2)
+
+        # Touch "a" so "b" becomes the eviction candidate
+        assert cache.get("a") == 1
+        cache.set("c", 3)
+
+        assert "a" in cache
+        assert "b" not in cache
+        assert "c" in cache
+        assert len(cache) == 2
+
+    def test_zero_maxsize_disables_caching(self):
+        """A cache with maxsize=0 should never store anything."""
+        cache = LRUCache(maxsize=0)
+        cache.set("a", 1)
+
+        assert len(cache) == 0
+        assert cache.get("a") is None
+
+    def test_pop_and_clear(self):
+        """pop() removes a single entry; clear() removes all of them."""
+        cache = LRUCache(maxsize=4)
+        cache.set("a", 1)
+        cache.set("b", 2)
+
+        assert cache.pop("a") == 1
+        assert "a" not in cache
+
+        cache.clear()
+        assert len(cache) == 0
+
+    def test_maxbytes_evicts_until_under_budget(self):
+        """With maxbytes, old entries are evicted until total length fits."""
+        cache = LRUCache(maxsize=10, maxbytes=10)
+        cache.set("a", b"1234")
+        cache.set("b", b"5678")
+        cache.set("a", b"12")  # replacing an entry frees its old size
+        cache.set("c", b"abcde")
+
+        assert "b" not in cache
+        assert cache.get("a") == b"12"
+        assert cache.get("c") == b"abcde"
+
+        cache.set("big", b"x" * 11)
+        assert "big" not in cache
+        assert len(cache) == 2
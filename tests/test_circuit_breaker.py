@@ -1,12 +1,29 @@
 """Unit tests for app.circuit_breaker module."""
 
-import time
-from unittest.mock import patch
+import pytest
 
 from app.circuit_breaker import CircuitBreaker, CircuitState, get_breaker, _breakers
 from app.exceptions import CircuitBreakerOpenError
 
 
+class _Clock:
+    """Settable stand-in for time.monotonic."""
+
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    """Drive app.circuit_breaker's time.monotonic from a settable clock."""
+    fake = _Clock()
+    monkeypatch.setattr("app.circuit_breaker.time.monotonic", fake)
+    return fake
+
+
 class TestCircuitBreaker:
     """Tests for the CircuitBreaker class."""
 
@@ -45,34 +62,32 @@ class TestCircuitBreaker:
             assert exc.service_name == "test-service"
             assert exc.retry_after > 0
 
-    @patch("app.circuit_breaker.time.monotonic")
-    def test_transitions_to_half_open_after_timeout(self, mock_monotonic):
+    def test_transitions_to_half_open_after_timeout(self, clock):
         """After recovery_timeout elapses the circuit should move to HALF_OPEN."""
         cb = CircuitBreaker("test-service", failure_threshold=2, recovery_timeout=30.0)
 
         # Time when failures happen
-        mock_monotonic.return_value = 100.0
+        clock.now = 100.0
         cb.record_failure()
         cb.record_failure()
         assert cb.state == CircuitState.OPEN
 
         # Advance time past recovery_timeout
-        mock_monotonic.return_value = 131.0  # 100 + 31 > 30
+        clock.now = 131.0  # 100 + 31 > 30
         assert cb.state == CircuitState.HALF_OPEN
 
-    @patch("app.circuit_breaker.time.monotonic")
-    def test_closes_on_success_from_half_open(self, mock_monotonic):
+    def test_closes_on_success_from_half_open(self, clock):
         """A success recorded in HALF_OPEN should transition back to CLOSED."""
         cb = CircuitBreaker("test-service", failure_threshold=2, recovery_timeout=10.0)
 
         # Open the circuit
-        mock_monotonic.return_value = 100.0
+        clock.now = 100.0
         cb.record_failure()
         cb.record_failure()
         assert cb.state == CircuitState.OPEN
 
         # Move to HALF_OPEN
-        mock_monotonic.return_value = 111.0
+        clock.now = 111.0
         assert cb.state == CircuitState.HALF_OPEN
 
         # Record success -> should go back to CLOSED
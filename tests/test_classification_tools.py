@@ -0,0 +1,109 @@
+"""Unit tests for app.tools.classification_tools."""
+
+import logging
+from unittest.mock import MagicMock, patch
+
+import httpx
+
+from app.tools import classification_tools
+from app.tools.classification_tools import classify_questions_batch
+
+
+def _llm_returning(content):
+    """Build a mock LLM whose invoke() returns a message with ``content``."""
+    response = MagicMock()
+    response.content = content
+    llm = MagicMock()
+    llm.invoke.return_value = response
+    return llm
+
+
+class TestClassificationCache:
+    """Tests for reuse of classifications across identical questions."""
+
+    def setup_method(self):
+        classification_tools._classification_cache.clear()
+
+    @patch("app.tools.classification_tools.PromptTemplateBuilder")
+    @patch("app.tools.classification_tools.get_llm")
+    def test_repeated_question_skips_llm(self, mock_get_llm, mock_ptb):
+        """The same content under a new ID should be served without an LLM call."""
+        llm = _llm_returning('[{"question_id": "q1", "topic": "math", "tags": ["area"]}]')
+        mock_get_llm.return_value = llm
+        mock_ptb.build_from_file.return_value = "prompt"
+        question = {"question_text": "Area of a 3x4 rectangle?", "question_type": "open_ended"}
+
+        first = classify_questions_batch.invoke({"questions": [{**question, "question_id": "q1"}]})
+        second = classify_questions_batch.invoke({"questions": [{**question, "question_id": "q2"}]})
+
+        assert first[0]["topic"] == "math"
+        assert second == [{"question_id": "q2", "topic": "math", "tags": ["area"]}]
+        assert llm.invoke.call_count == 1
+
+    @patch("app.tools.classification_tools.PromptTemplateBuilder")
+    @patch("app.tools.classification_tools.get_llm")
+    def test_only_misses_are_sent_to_llm(self, mock_get_llm, mock_ptb):
+        """A batch mixing cached and new questions should prompt for the new ones only."""
+        mock_ptb.build_from_file.return_value = "prompt"
+        mock_get_llm.return_value = _llm_returning('[{"question_id": "a", "topic": "math"}]')
+        classify_questions_batch.invoke({"questions": [{"question_id": "a", "question_text": "2+2?"}]})
+
+        mock_get_llm.return_value = _llm_returning('[{"question_id": "b", "topic": "history"}]')
+        results = classify_questions_batch.invoke({"questions": [
+            {"question_id": "a", "question_text": "2+2?"},
+            {"question_id": "b", "question_text": "When did Rome fall?"},
+        ]})
+
+        questions_json = mock_ptb.build_from_file.call_args.kwargs["variables"]["questions_json"]
+        assert "When did Rome fall?" in questions_json
+        assert "2+2?" not in questions_json
+        assert {r["question_id"]: r["topic"] for r in results} == {"a": "math", "b": "history"}
+
+    @patch("app.tools.classification_tools.PromptTemplateBuilder")
+    @patch("app.tools.classification_tools.get_llm")
+    def test_results_follow_input_order(self, mock_get_llm, mock_ptb):
+        """Cached and fresh results should come back in the order of the questions."""
+        mock_ptb.build_from_file.return_value = "prompt"
+        mock_get_llm.return_value = _llm_returning('[{"question_id": "b", "topic": "history"}]')
+        classify_questions_batch.invoke({"questions": [{"question_id": "b", "question_text": "When did Rome fall?"}]})
+
+        mock_get_llm.return_value = _llm_returning(
+            '[{"question_id": "c", "topic": "art"}, {"question_id": "a", "topic": "math"}]'
+        )
+        results = classify_questions_batch.invoke({"questions": [
+            {"question_id": "a", "question_text": "2+2?"},
+            {"question_id": "b", "question_text": "When did Rome fall?"},
+            {"question_id": "c", "question_text": "Who painted the Mona Lisa?"},
+        ]})
+
+        assert [r["question_id"] for r in results] == ["a", "b", "c"]
+
+
+class TestExpectedErrors:
+    """Tests for how LLM failures are logged once retries are exhausted."""
+
+    def setup_method(self):
+        classification_tools._classification_cache.clear()
+
+    @patch("app.retry.time.sleep")
+    @patch("app.tools.classification_tools.PromptTemplateBuilder")
+    @patch("app.tools.classification_tools.get_llm")
+    def test_provider_connection_error_is_logged_without_traceback(
+        self, mock_get_llm, mock_ptb, _mock_sleep, caplog
+    ):
+        """An httpx connection failure from the provider is expected, so no traceback is logged."""
+        mock_ptb.build_from_file.return_value = "prompt"
+        llm = MagicMock()
+        llm.invoke.side_effect = httpx.ConnectError("connection refused")
+        mock_get_llm.return_value = llm
+
+        with caplog.at_level(logging.WARNING, logger="app.tools.classification_tools"):
+            results = classify_questions_batch.invoke(
+                {"questions": [{"question_id": "q1", "question_text": "2+2?"}]}
+            )
+
+        assert results == []
+        records = [r for r in caplog.records if "Error in batch classification" in r.getMessage()]
+        assert len(records) == 1
+        assert records[0].levelno == logging.WARNING
+        assert records[0].exc_info is None
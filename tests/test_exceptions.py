@@ -43,9 +43,9 @@ class TestExceptionHierarchy:
         assert exc.service_name == "my-service"
         assert exc.retry_after == 42.5
 
-    @pytest.mark.parametrize(
-        "exc_cls, args, expected_fragment",
-        [
+    def test_exception_messages(self):
+        """Exception str() should contain the expected message fragment."""
+        cases = [
             (LLMError, ("provider timeout",), "provider timeout"),
             (LLMResponseParseError, ("bad json",), "bad json"),
             (DoclingError, ("conversion failed",), "conversion failed"),
@@ -57,10 +57,9 @@ class TestExceptionHierarchy:
                 ("llm-service", 10.0),
                 "Circuit breaker open for 'llm-service'",
             ),
-        ],
-        ids=lambda x: x.__name__ if isinstance(x, type) else str(x),
-    )
-    def test_exception_messages(self, exc_cls, args, expected_fragment):
-        """Exception str() should contain the expected message fragment."""
-        exc = exc_cls(*args)
-        assert expected_fragment in str(exc)
+        ]
+
+        for exc_cls, args, expected_fragment in cases:
+            message = str(exc_cls(*args))
+            if expected_fragment not in message:
+                pytest.fail(f"{exc_cls.__name__}: {expected_fragment!r} not in {message!r}")
@@ -3,21 +3,11 @@
 import pytest
 from unittest.mock import patch, MagicMock
 
-import httpx
-
 
 @pytest.mark.asyncio
-async def test_health_returns_status():
+async def test_health_returns_status(app_client):
     """GET /health should return 200 with status 'healthy'."""
-    with patch("app.main.Base"), \
-         patch("app.main.engine"), \
-         patch("app.main.SessionLocal"):
-
-        from app.main import app
-
-        transport = httpx.ASGITransport(app=app)
-        async with httpx.AsyncClient(transport=transport, base_url="http://testserver") as client:
-            response = await client.get("/health")
+    response = await app_client.get("/health")
 
     assert response.status_code == 200
     data = response.json()
@@ -25,7 +15,7 @@ async def test_health_returns_status():
 
 
 @pytest.mark.asyncio
-async def test_health_detailed_structure():
+async def test_health_detailed_structure(app_client):
     """GET /health/detailed should return JSON with 'status' and 'checks' keys.
 
     Because the database, GCS, and Docling are not available in tests the
@@ -42,16 +32,9 @@ async def test_health_detailed_structure():
     mock_storage_instance.bucket.exists.return_value = True
     mock_storage_cls.return_value = mock_storage_instance
 
-    with patch("app.main.Base"), \
-         patch("app.main.engine"), \
-         patch("app.main.SessionLocal", return_value=mock_session), \
+    with patch("app.main.SessionLocal", return_value=mock_session), \
          patch("app.services.storage_service.StorageService", mock_storage_cls):
-
-        from app.main import app
-
-        transport = httpx.ASGITransport(app=app)
-        async with httpx.AsyncClient(transport=transport, base_url="http://testserver") as client:
-            response = await client.get("/health/detailed")
+        response = await app_client.get("/health/detailed")
 
     assert response.status_code == 200
     data = response.json()
@@ -3,6 +3,8 @@
 import logging
 from unittest.mock import patch, MagicMock
 
+from app.services.extraction_orchestrator import _update_job_status
+
 
 class TestUpdateJobStatus:
     """Tests for the _update_job_status helper with retry logic."""
@@ -11,8 +13,6 @@ class TestUpdateJobStatus:
     @patch("app.services.extraction_orchestrator.JobService")
     def test_update_job_status_succeeds(self, mock_job_service, mock_session_cls):
         """On first success the function should call update_status and close the session."""
-        from app.services.extraction_orchestrator import _update_job_status
-
         mock_db = MagicMock()
         mock_session_cls.return_value = mock_db
 
@@ -27,8 +27,6 @@ class TestUpdateJobStatus:
     @patch("app.services.extraction_orchestrator.JobService")
     def test_update_job_status_retries_on_failure(self, mock_job_service, mock_session_cls):
         """When update_status fails on the first attempt it should retry and succeed."""
-        from app.services.extraction_orchestrator import _update_job_status
-
         mock_db = MagicMock()
         mock_session_cls.return_value = mock_db
 
@@ -50,8 +48,6 @@ class TestUpdateJobStatus:
         self, mock_job_service, mock_session_cls, caplog
     ):
         """After all 3 attempts fail, a CRITICAL log should be emitted."""
-        from app.services.extraction_orchestrator import _update_job_status
-
         mock_db = MagicMock()
         mock_session_cls.return_value = mock_db
 
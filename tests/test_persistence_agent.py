@@ -1,45 +1,49 @@
 """Unit tests for app.agents.persistence_agent.PersistenceAgent."""
 
-from unittest.mock import patch, MagicMock
+from unittest.mock import patch
 
 import pytest
 
+from app.agents.persistence_agent import PersistenceAgent
+
+
+@pytest.fixture(autouse=True, scope="class")
+def _prompt_builder():
+    """Patch the agent's prompt builder once per test class.
+
+    Every test uses the same canned prompt, so one patch serves the class.
+    """
+    with patch("app.agents.persistence_agent.PromptTemplateBuilder") as mock_ptb:
+        mock_ptb.build_from_file.return_value = "fake prompt"
+        yield mock_ptb
+
 
 class TestPersistenceAgent:
     """Tests for PersistenceAgent question extraction edge cases."""
 
-    @patch("app.agents.persistence_agent.get_llm")
-    @patch("app.agents.persistence_agent.PromptTemplateBuilder")
-    @patch("app.agents.persistence_agent.SessionLocal")
-    @patch("app.agents.persistence_agent.StorageService")
-    def test_process_handles_empty_questions(
-        self,
-        mock_storage_cls,
-        mock_session_cls,
-        mock_ptb,
-        mock_get_llm,
-        sample_agent_state,
-    ):
+    @pytest.fixture(autouse=True)
+    def _patches(self):
+        """Patch the agent's LLM, database and storage dependencies."""
+        with patch("app.agents.persistence_agent.get_llm") as mock_get_llm, \
+             patch("app.agents.persistence_agent.SessionLocal") as mock_session_cls, \
+             patch("app.agents.persistence_agent.StorageService") as mock_storage_cls:
+            self.mock_get_llm = mock_get_llm
+            self.mock_session_cls = mock_session_cls
+            self.mock_storage_cls = mock_storage_cls
+            yield
+
+    def test_process_handles_empty_questions(self, mocks, make_sample_state):
         """When the LLM returns no questions the agent should still succeed."""
-        from app.agents.persistence_agent import PersistenceAgent
-
         # LLM returns empty JSON array
-        mock_response = MagicMock()
-        mock_response.content = "[]"
-        mock_llm = MagicMock()
-        mock_llm.invoke.return_value = mock_response
-        mock_get_llm.return_value = mock_llm
-
-        mock_ptb.build_from_file.return_value = "fake prompt"
+        mocks.llm.invoke.return_value.content = "[]"
+        self.mock_get_llm.return_value = mocks.llm
 
-        # Mock storage service instance
-        mock_storage = MagicMock()
-        mock_storage.upload_images_from_zip.return_value = {}
-        mock_storage_cls.return_value = mock_storage
+        # Mock storage service instance (upload_images_from_zip returns {})
+        self.mock_storage_cls.return_value = mocks.gcs
 
         # Mock database session -- flush/commit succeed, but no real DB
-        mock_db = MagicMock()
-        mock_session_cls.return_value = mock_db
+        mock_db = mocks.db
+        self.mock_session_cls.return_value = mock_db
 
         # The agent calls db.add(document) then db.flush() which should set
         # document.id.  We simulate that by making the added Document's id
@@ -54,14 +58,15 @@ class TestPersistenceAgent:
 
         mock_db.add.side_effect = side_effect_add
 
-        state = dict(sample_agent_state)
-        state["cleaned_markdown"] = "# Test\n\nNo real questions here."
-        state["output_zip_path"] = None
+        state = make_sample_state(
+            cleaned_markdown="# Test\n\nNo real questions here.",
+            output_zip_path=None,
+        )
 
         # Create agent without calling __init__ (avoids settings / GCS import)
         agent = PersistenceAgent.__new__(PersistenceAgent)
         agent.llm_model = "test-model"
-        agent.storage_service = mock_storage
+        agent.storage_service = mocks.gcs
 
         result = agent.process(state)
 
@@ -71,8 +76,6 @@ class TestPersistenceAgent:
 
     def test_parse_questions_json_handles_malformed(self):
         """Malformed JSON should return an empty list, not raise."""
-        from app.agents.persistence_agent import PersistenceAgent
-
         agent = PersistenceAgent.__new__(PersistenceAgent)
 
         # Completely invalid JSON
@@ -0,0 +1,136 @@
+"""Unit tests for app.services.prompt_template_builder.PromptTemplateBuilder."""
+
+import os
+
+from app.services.prompt_template_builder import PromptTemplateBuilder
+
+
+class TestFromFile:
+    """Tests for loading prompt configs from YAML files."""
+
+    def test_repeat_loads_return_independent_copies(self, tmp_path):
+        """Cached configs should be copied so one builder can't alter another's."""
+        (tmp_path / "greet.yaml").write_text("instruction: Say hi to {name}\n")
+
+        first = PromptTemplateBuilder.from_file("greet", prompts_dir=tmp_path)
+        first.config["instruction"] = "mutated"
+        second = PromptTemplateBuilder.from_file("greet", prompts_dir=tmp_path)
+
+        assert second.config == {"instruction": "Say hi to {name}"}
+
+    def test_edited_file_is_reloaded(self, tmp_path):
+        """A change to the YAML file should be picked up on the next load."""
+        path = tmp_path / "greet.yaml"
+        path.write_text("instruction: Say hi\n")
+        PromptTemplateBuilder.from_file("greet", prompts_dir=tmp_path)
+
+        path.write_text("instruction: Say goodbye\n")
+        # Force a distinct mtime in case both writes land in the same tick
+        stat = path.stat()
+        os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000))
+
+        builder = PromptTemplateBuilder.from_file("greet", prompts_dir=tmp_path)
+
+        assert builder.config == {"instruction": "Say goodbye"}
+
+
+class TestBuild:
+    """Tests for assembling and rendering prompts."""
+
+    def test_build_matches_assemble_then_render(self):
+        """build() should equal rendering the assembled, unsubstituted text."""
+        config = {
+            "role": "Tutor",
+            "instruction": "Explain {topic}",
+            "constraints": ["Mention {topic} once"],
+            "extra_notes": {"tips": ["Be brief"]},
+        }
+
+        assembled = PromptTemplateBuilder(config).assemble()
+        built = PromptTemplateBuilder(config, {"topic": "fractions"}).build()
+
+        assert "{topic}" in assembled
+        assert built == PromptTemplateBuilder(config, {"topic": "fractions"}).render(assembled)
+        assert built.startswith("Role: Tutor\n\nInstruction: Explain fractions")
+
+    def test_build_from_file_renders_each_call_with_its_variables(self, tmp_path):
+        """Repeat build_from_file calls should substitute their own variables."""
+        (tmp_path / "greet.yaml").write_text("instruction: Say hi to {name}\n")
+
+        first = PromptTemplateBuilder.build_from_file("greet", {"name": "Ada"}, prompts_dir=tmp_path)
+        second = PromptTemplateBuilder.build_from_file("greet", {"name": "Bob"}, prompts_dir=tmp_path)
+
+        assert first == "Instruction: Say hi to Ada"
+        assert second == "Instruction: Say hi to Bob"
+
+    def test_build_reflects_config_changes(self, tmp_path):
+        """Editing a builder's config between builds should change the output."""
+        (tmp_path / "greet.yaml").write_text("instruction: Say hi to {name}\n")
+        loaded = PromptTemplateBuilder.from_file("greet", {"name": "Ada"}, prompts_dir=tmp_path)
+        plain = PromptTemplateBuilder({"instruction": "Say hi to {name}"}, {"name": "Ada"})
+
+        for builder in (loaded, plain):
+            assert builder.build() == "Instruction: Say hi to Ada"
+            builder.config["instruction"] = "Say bye to {name}"
+            assert builder.build() == "Instruction: Say bye to Ada"
+
+        # The cached file template is unaffected by the edit
+        assert PromptTemplateBuilder.build_from_file(
+            "greet", {"name": "Ada"}, prompts_dir=tmp_path
+        ) == "Instruction: Say hi to Ada"
+
+
+class TestVariables:
+    """Tests for placeholder detection."""
+
+    def test_required_variables_found_in_nested_values(self):
+        """Placeholders in nested dicts and lists should all be reported, sorted and unique."""
+        config = {
+            "instruction": "Summarize {document}",
+            "requirements": ["At most {word_count} words", "Cite {document}"],
+            "output": {"format": ["Title: {title}"], "max_items": 3},
+        }
+
+        builder = PromptTemplateBuilder(config)
+
+        assert builder.get_required_variables() == ["document", "title", "word_count"]
+
+    def test_schema_reflects_config_changes(self):
+        """Editing variable_schema or placeholders should affect later validation."""
+        builder = PromptTemplateBuilder({"instruction": "Say hi to {name}"})
+        assert builder.validate_variables({}) == (False, ["name"])
+
+        builder.config["instruction"] = "Say hi to {name} from {sender}"
+        assert builder.get_required_variables() == ["name", "sender"]
+
+        builder.config["variable_schema"] = {"name": {"required": False}}
+        assert builder.validate_variables({}) == (True, [])
+
+    def test_substitution_leaves_other_braces_alone(self):
+        """Only known placeholders are replaced; substituted values are not re-scanned."""
+        config = {
+            "instruction": "Fix {markdown_content} keeping {json} and $\\frac{a}{b}$",
+            "variable_schema": {"markdown_content": {"required": True}, "json": {"required": True}},
+        }
+        variables = {"markdown_content": "see {markdown_content}", "json": '{"k": 1}'}
+
+        prompt = PromptTemplateBuilder(config, variables).build()
+
+        assert prompt == 'Instruction: Fix see {markdown_content} keeping {"k": 1} and $\\frac{a}{b}$'
+
+    def test_cache_prefix_sections_are_emitted_first(self):
+        """Sections named in template_config.cache_prefix_sections lead the prompt."""
+        config = {
+            "role": "Classifier",
+            "context": "{questions_json}",
+            "instruction": "Classify each question",
+            "output_constraints": ["JSON only"],
+            "template_config": {"cache_prefix_sections": ["role", "instruction"]},
+        }
+
+        prompt = PromptTemplateBuilder(config, {"questions_json": "[]"}).build()
+
+        assert prompt == (
+            "Role: Classifier\n\nInstruction: Classify each question\n\n"
+            "Context: []\n\nOutput Constraints:\n\n  - JSON only"
+        )
@@ -0,0 +1,56 @@
+"""Unit tests for app.services.similarity_cache.SimilarityCache."""
+
+from unittest.mock import patch
+
+from app.services.similarity_cache import SimilarityCache
+
+
+class TestSimilarityCache:
+    """Tests for the per-user search result cache."""
+
+    def test_near_identical_query_hits(self):
+        """A query vector above the threshold should return the cached results."""
+        cache = SimilarityCache(max_entries=4, threshold=0.95)
+        cache.put("user-1", (10, 0.3), [1.0, 0.0, 0.0], [{"similarity": 0.9}])
+
+        assert cache.get("user-1", (10, 0.3), [0.99, 0.05, 0.0]) == [{"similarity": 0.9}]
+
+    def test_dissimilar_query_or_other_params_miss(self):
+        """Different queries, parameters or users should not reuse results."""
+        cache = SimilarityCache(max_entries=4, threshold=0.95)
+        cache.put("user-1", (10, 0.3), [1.0, 0.0, 0.0], [{"similarity": 0.9}])
+
+        assert cache.get("user-1", (10, 0.3), [0.0, 1.0, 0.0]) is None
+        assert cache.get("user-1", (5, 0.3), [1.0, 0.0, 0.0]) is None
+        assert cache.get("user-2", (10, 0.3), [1.0, 0.0, 0.0]) is None
+
+    def test_cached_results_are_copies(self):
+        """Mutating returned results should not alter the cache."""
+        cache = SimilarityCache(max_entries=4)
+        cache.put("user-1", (10, 0.3), [1.0, 0.0], [{"similarity": 0.9}])
+
+        cache.get("user-1", (10, 0.3), [1.0, 0.0])[0]["similarity"] = 0.0
+
+        assert cache.get("user-1", (10, 0.3), [1.0, 0.0]) == [{"similarity": 0.9}]
+
+    @patch("app.services.similarity_cache.time.monotonic")
+    def test_entries_expire_and_can_be_invalidated(self, mock_monotonic):
+        """Expired entries and invalidated users should miss."""
+        mock_monotonic.return_value = 0.0
+        cache = SimilarityCache(max_entries=4, ttl=60.0)
+        cache.put("user-1", (10, 0.3), [1.0, 0.0], [])
+        cache.put("user-2", (10, 0.3), [1.0, 0.0], [])
+
+        mock_monotonic.return_value = 61.0
+        assert cache.get("user-1", (10, 0.3), [1.0, 0.0]) is None
+
+        mock_monotonic.return_value = 0.0
+        cache.invalidate("user-2")
+        assert cache.get("user-2", (10, 0.3), [1.0, 0.0]) is None
+
+    def test_zero_max_entries_disables_cache(self):
+        """With max_entries=0 nothing is stored."""
+        cache = SimilarityCache(max_entries=0)
+        cache.put("user-1", (10, 0.3), [1.0, 0.0], [{"similarity": 0.9}])
+
+        assert cache.get("user-1", (10, 0.3), [1.0, 0.0]) is None
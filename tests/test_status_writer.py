@@ -0,0 +1,47 @@
+"""Unit tests for app.services.status_writer.StatusWriter."""
+
+from unittest.mock import patch, MagicMock
+
+from app.services.status_writer import StatusWriter
+
+
+class TestStatusWriter:
+    """Tests for the write-behind job status queue."""
+
+    @patch("app.services.status_writer.SessionLocal")
+    @patch("app.services.status_writer.JobService")
+    def test_flush_writes_latest_status_per_job(self, mock_job_service, mock_session_cls):
+        """Pending updates should be coalesced to one bulk write with the newest status per job."""
+        mock_db = MagicMock()
+        mock_session_cls.return_value = mock_db
+
+        # Long interval so the background thread does not flush first
+        writer = StatusWriter(flush_interval=60.0)
+        writer.submit("job-1", "ingesting")
+        writer.submit("job-2", "parsing")
+        writer.submit("job-1", "parsing")
+        writer.flush()
+
+        mock_job_service.bulk_update_status.assert_called_once_with(
+            mock_db, {"job-1": "parsing", "job-2": "parsing"}
+        )
+        mock_db.close.assert_called_once()
+
+    @patch("app.services.status_writer.SessionLocal")
+    @patch("app.services.status_writer.JobService")
+    def test_flush_swallows_database_errors(self, mock_job_service, mock_session_cls):
+        """A failed progress write should be logged, not raised, and the session closed."""
+        mock_db = MagicMock()
+        mock_session_cls.return_value = mock_db
+        mock_job_service.bulk_update_status.side_effect = RuntimeError("db down")
+
+        writer = StatusWriter(flush_interval=60.0)
+        writer.submit("job-1", "parsing")
+        writer.flush()
+
+        mock_db.close.assert_called_once()
+
+        # Nothing left pending after a flush
+        mock_job_service.bulk_update_status.reset_mock()
+        writer.flush()
+        mock_job_service.bulk_update_status.assert_not_called()